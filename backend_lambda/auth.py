@@ -1,57 +1,121 @@
+import binascii
 import json
+import os
 import time
-import urllib.request
-from datetime import datetime, timedelta
+from collections import OrderedDict
 
-from jose import jwk, jwt
-from jose.utils import base64url_decode
+import urllib3
+from jose import jwk
 from psycopg2.extras import RealDictCursor
 
 from config import (
-    AWS_REGION, COGNITO_CLIENT_ID, COGNITO_USER_POOL_ID,
+    COGNITO_CLIENT_ID, COGNITO_ISSUER, COGNITO_JWKS_URL, COGNITO_USER_POOL_ID,
     REFRESH_TOKEN_DAYS, TOKEN_USE_ALLOWED, cognito, logger,
 )
-from db import get_db_connection, release_db_connection
+from db import ensure_prepared, pooled_conn
 from helpers import _hash_token, api_response
 
-jwks_cache = None
+# base64url -> standard alphabet, then pad to a multiple of 4 (indexed by len % 4)
+_B64URL_TBL = bytes.maketrans(b"-_", b"+/")
+_B64_PAD = (b"", b"===", b"==", b"=")
+
+
+def _b64url_decode(segment):
+    raw = segment.encode("ascii") if isinstance(segment, str) else segment
+    return binascii.a2b_base64(raw.translate(_B64URL_TBL) + _B64_PAD[len(raw) & 3])
+
+
+# Reused across warm invocations: key-rotation refetches resume the existing TLS connection.
+# Bounded timeouts so a slow JWKS endpoint can't hang the request.
+_HTTP = urllib3.PoolManager(
+    num_pools=1, maxsize=2,
+    timeout=urllib3.Timeout(connect=2.0, read=3.0),
+    retries=urllib3.Retry(total=2, backoff_factor=0.2),
+)
+
+# kid -> constructed public key, kept across warm invocations
+JWKS_BY_KID = {}
+JWKS_TTL_SECONDS = 6 * 3600
+JWKS_MIN_REFRESH_INTERVAL = 60  # tokens with unknown kids must not hammer the endpoint
+_jwks_fetched_at = 0.0
+MAX_TOKEN_LENGTH = 8192
+# token -> verified claims (LRU). A signature verdict holds until exp, so a repeat token
+# skips the RSA verify; entries are dropped near exp and whenever the JWKS is refetched.
+_VERIFY_CACHE = OrderedDict()
+VERIFY_CACHE_MAX = 1024
+VERIFY_CACHE_EXP_SKEW = 30
+EXPECTED_ISSUER = COGNITO_ISSUER
+# SQLSTATE 42P10: "no unique or exclusion constraint matching the ON CONFLICT specification"
+PG_NO_ON_CONFLICT_CONSTRAINT = "42P10"
+
+
+def refresh_jwks():
+    global _jwks_fetched_at
+    if not COGNITO_JWKS_URL:
+        raise RuntimeError("COGNITO_USER_POOL_ID is missing")
+    response = _HTTP.request("GET", COGNITO_JWKS_URL)
+    if response.status != 200:
+        raise RuntimeError(f"JWKS fetch failed with HTTP {response.status}")
+    keys = json.loads(response.data).get("keys", [])
+    # Build each RSA key object once per fetch; verify_jwt only does dict lookups afterwards.
+    # Encryption keys (use != "sig") are never needed for verification.
+    fresh = {
+        k["kid"]: jwk.construct(k, k.get("alg", "RS256"))
+        for k in keys
+        if k.get("kid") and k.get("use", "sig") == "sig"
+    }
+    JWKS_BY_KID.clear()
+    JWKS_BY_KID.update(fresh)
+    _jwks_fetched_at = time.time()
+    _VERIFY_CACHE.clear()
+    return JWKS_BY_KID
 
 
 def get_jwks():
-    global jwks_cache
-    if jwks_cache is None:
-        if not COGNITO_USER_POOL_ID:
-            raise RuntimeError("COGNITO_USER_POOL_ID is missing")
-        keys_url = f"https://cognito-idp.{AWS_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}/.well-known/jwks.json"
-        with urllib.request.urlopen(keys_url) as response:
-            jwks_cache = json.loads(response.read())
-    return jwks_cache
+    if not JWKS_BY_KID:
+        refresh_jwks()
+    elif time.time() - _jwks_fetched_at > JWKS_TTL_SECONDS:
+        try:
+            refresh_jwks()
+        except Exception as exc:
+            # Stale keys are still valid until Cognito rotates them
+            logger.warning(f"JWKS refresh failed, using cached keys: {exc}")
+    return JWKS_BY_KID
 
 
-def verify_jwt(token):
+def _get_public_key(kid):
+    key = get_jwks().get(kid)
+    if key is None and time.time() - _jwks_fetched_at > JWKS_MIN_REFRESH_INTERVAL:
+        # Key rotation: refetch once when an unknown kid shows up
+        key = refresh_jwks().get(kid)
+    return key
+
+
+def _verify_uncached(token):
     try:
-        if not token or not isinstance(token, str):
+        # Split once; header, payload and signature are each decoded exactly once
+        try:
+            h_b64, p_b64, s_b64 = token.split(".")
+        except ValueError:
             return None
-        token = token.strip()
-        headers = jwt.get_unverified_headers(token)
-        kid = headers.get("kid")
-        if not kid:
+        header = json.loads(_b64url_decode(h_b64))
+        kid = header.get("kid")
+        if not kid or header.get("alg") != "RS256":
             return None
-        keys = get_jwks().get("keys", [])
-        key = next((k for k in keys if k.get("kid") == kid), None)
-        if not key:
+        public_key = _get_public_key(kid)
+        if public_key is None:
             return None
-        public_key = jwk.construct(key)
-        message, encoded_signature = token.rsplit(".", 1)
-        decoded_signature = base64url_decode(encoded_signature.encode("utf-8"))
-        if not public_key.verify(message.encode("utf-8"), decoded_signature):
+        # Signing input is the token minus ".<signature>"; slice it instead of re-joining
+        signing_input = token[:-len(s_b64) - 1].encode("ascii")
+        if not public_key.verify(signing_input, _b64url_decode(s_b64)):
             return None
-        claims = jwt.get_unverified_claims(token)
-        if time.time() > claims.get("exp", 0):
+        claims = json.loads(_b64url_decode(p_b64))
+        now = time.time()
+        if now > claims.get("exp", 0) or now < claims.get("nbf", 0):
             return None
-        issuer = claims.get("iss", "")
-        if COGNITO_USER_POOL_ID and COGNITO_USER_POOL_ID not in issuer:
+        if EXPECTED_ISSUER and claims.get("iss") != EXPECTED_ISSUER:
             return None
+        # Cognito access tokens carry client_id instead of aud
         if COGNITO_CLIENT_ID:
             token_client = claims.get("client_id") or claims.get("aud")
             if token_client != COGNITO_CLIENT_ID:
@@ -64,45 +128,92 @@ def verify_jwt(token):
         return None
 
 
-def _ensure_user_record(claims, fallback_full_name=None):
-    conn = get_db_connection()
+def verify_jwt(token):
+    if not token or not isinstance(token, str):
+        return None
+    token = token.strip()
+    # Reject garbage before it reaches the decoder or the verify cache
+    if len(token) > MAX_TOKEN_LENGTH or token.count(".") != 2:
+        logger.debug(f"Rejected malformed token (length={len(token)})")
+        return None
+    now = time.time()
+    claims = _VERIFY_CACHE.get(token)
+    if claims is not None:
+        if now < claims["exp"] - VERIFY_CACHE_EXP_SKEW:
+            _VERIFY_CACHE.move_to_end(token)
+            # Callers get their own copy; the cached dict stays untouched
+            return dict(claims)
+        del _VERIFY_CACHE[token]
+    claims = _verify_uncached(token)
+    if claims is None:
+        return None
+    # Only successful verdicts are kept, and only while comfortably before exp
+    if now < claims.get("exp", 0) - VERIFY_CACHE_EXP_SKEW:
+        _VERIFY_CACHE[token] = claims
+        if len(_VERIFY_CACHE) > VERIFY_CACHE_MAX:
+            _VERIFY_CACHE.popitem(last=False)
+    return dict(claims)
+
+
+# Warm the key cache during the Lambda init phase. A failure here never breaks the
+# import; the first verify_jwt call simply retries.
+if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") and COGNITO_USER_POOL_ID:
     try:
-        sub = claims.get("sub")
-        email = claims.get("email") or claims.get("username") or ""
-        full_name = claims.get("name") or fallback_full_name
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """INSERT INTO user_data (cognito_sub, email, full_name)
-                VALUES (%s, %s, %s)
-                ON CONFLICT (cognito_sub)
-                DO UPDATE SET email = EXCLUDED.email, full_name = COALESCE(EXCLUDED.full_name, user_data.full_name)
-                RETURNING id, cognito_sub, email, full_name, created_at""",
-                (sub, email, full_name),
-            )
-            user = cur.fetchone()
-            conn.commit()
+        refresh_jwks()
+    except Exception as exc:
+        logger.warning(f"JWKS prefetch skipped: {exc}")
+
+
+def _ensure_user_record(claims, fallback_full_name=None):
+    sub = claims.get("sub")
+    email = claims.get("email") or claims.get("username") or ""
+    full_name = claims.get("name") or fallback_full_name
+    with pooled_conn(RealDictCursor) as (conn, cur):
+        ensure_prepared(conn)
+        # Steady state: the row exists and is unchanged, so a plain read avoids the upsert's
+        # row lock and WAL write. cognito_sub is UNIQUE, so this is an index lookup.
+        cur.execute("EXECUTE user_by_sub(%s)", (sub,))
+        user = cur.fetchone()
+        if user and user.get("email") == email and (full_name is None or user.get("full_name") == full_name):
             return user
-    finally:
-        release_db_connection(conn)
+        cur.execute("EXECUTE user_upsert(%s, %s, %s)", (sub, email, full_name))
+        user = cur.fetchone()
+        conn.commit()
+        return user
 
 
 def _save_refresh_token(user_id, refresh_token):
     if not refresh_token:
         return
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("DELETE FROM refresh_tokens WHERE user_id=%s OR expires_at < NOW()", (user_id,))
+    params = (user_id, _hash_token(refresh_token), REFRESH_TOKEN_DAYS)
+    with pooled_conn() as (conn, cur):
+        try:
+            # One row per user (uq_refresh_tokens_user): a new login overwrites the previous token
             cur.execute(
-                "INSERT INTO refresh_tokens (user_id, token_hash, expires_at) VALUES (%s, %s, %s)",
-                (user_id, _hash_token(refresh_token), datetime.utcnow() + timedelta(days=REFRESH_TOKEN_DAYS)),
+                """INSERT INTO refresh_tokens (user_id, token_hash, expires_at)
+                VALUES (%s, %s, NOW() + make_interval(days => %s))
+                ON CONFLICT (user_id) DO UPDATE SET token_hash = EXCLUDED.token_hash, expires_at = EXCLUDED.expires_at""",
+                params,
             )
             conn.commit()
-    except Exception as exc:
-        logger.warning(f"Refresh token save skipped: {exc}")
-        conn.rollback()
-    finally:
-        release_db_connection(conn)
+            return
+        except Exception as exc:
+            conn.rollback()
+            if getattr(exc, "pgcode", None) != PG_NO_ON_CONFLICT_CONSTRAINT:
+                logger.warning(f"Refresh token save skipped: {exc}")
+                return
+        # The unique index comes from the startup migration; until it has run, replace the row by hand
+        logger.warning("uq_refresh_tokens_user missing, saving refresh token via delete+insert")
+        try:
+            cur.execute("DELETE FROM refresh_tokens WHERE user_id=%s", (user_id,))
+            cur.execute(
+                "INSERT INTO refresh_tokens (user_id, token_hash, expires_at) VALUES (%s, %s, NOW() + make_interval(days => %s))",
+                params,
+            )
+            conn.commit()
+        except Exception as exc:
+            logger.warning(f"Refresh token save skipped: {exc}")
+            conn.rollback()
 
 
 def handle_auth_register(body):
@@ -194,7 +305,8 @@ def handle_auth_login(body):
         refresh_token = auth.get("RefreshToken")
         if not id_token or not access_token:
             return api_response(401, {"error": "Kimlik doğrulama başarısız oldu."})
-        claims = jwt.get_unverified_claims(id_token)
+        # Token comes straight from Cognito over TLS; only the payload segment is needed
+        claims = json.loads(_b64url_decode(id_token.split(".")[1]))
         user = _ensure_user_record(claims, fallback_full_name=(body or {}).get("full_name"))
         _save_refresh_token(user["id"], refresh_token)
         return api_response(200, {
@@ -259,16 +371,10 @@ def handle_auth_refresh(body):
 
 
 def handle_auth_me(user_id):
-    conn = get_db_connection()
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                "SELECT id, cognito_sub, email, full_name, created_at FROM user_data WHERE id=%s",
-                (user_id,),
-            )
-            user = cur.fetchone()
-            if not user:
-                return api_response(404, {"error": "User not found"})
-            return api_response(200, {"user": user})
-    finally:
-        release_db_connection(conn)
+    with pooled_conn(RealDictCursor) as (conn, cur):
+        ensure_prepared(conn)
+        cur.execute("EXECUTE user_by_id(%s)", (user_id,))
+        user = cur.fetchone()
+    if not user:
+        return api_response(404, {"error": "User not found"})
+    return api_response(200, {"user": user})
@@ -20,6 +20,21 @@ import traceback
 
 import boto3
 from botocore.config import Config
+from botocore.exceptions import ClientError
+
+try:
+    import orjson
+except ImportError:  # orjson yoksa stdlib'e düş (lokal geliştirme / testler)
+    orjson = None
+
+
+def _dumps(obj) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str).decode()
+        except TypeError:
+            pass  # >64-bit int, str olmayan dict anahtarı vb. — stdlib her şeyi yazabilir
+    return json.dumps(obj, ensure_ascii=False, default=str)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -39,6 +54,17 @@ class _StructuredFormatter(logging.Formatter):
         "method", "path", "module",
     )
 
+    # Ekstra alan taramasında atlanacak LogRecord öznitelikleri — her log satırında yeniden kurulmaz
+    _SKIP_FIELDS = frozenset({
+        "msg", "args", "created", "filename", "funcName", "levelname",
+        "levelno", "lineno", "module", "msecs", "name", "pathname",
+        "process", "processName", "relativeCreated", "stack_info",
+        "taskName", "thread", "threadName", "exc_info", "exc_text",
+        "message",  # getMessage() ile zaten alındı
+        "module_name", "email",
+        *ALWAYS_FIELDS,
+    })
+
     def format(self, record: logging.LogRecord) -> str:
         entry: dict = {
             "timestamp": self.formatTime(record, self.datefmt),
@@ -66,19 +92,12 @@ class _StructuredFormatter(logging.Formatter):
             entry["exception_type"] = record.exc_info[0].__name__
 
         # Ekstra alanlar (extra= ile geçirilen ama yukarıda ele alınmayanlar)
-        skip = {
-            "msg", "args", "created", "filename", "funcName", "levelname",
-            "levelno", "lineno", "module", "msecs", "name", "pathname",
-            "process", "processName", "relativeCreated", "stack_info",
-            "taskName", "thread", "threadName", "exc_info", "exc_text",
-            "message",  # getMessage() ile zaten alındı
-        } | set(self.ALWAYS_FIELDS) | {"module_name", "email"}
-
+        skip = self._SKIP_FIELDS
         for key, val in record.__dict__.items():
             if key not in skip and not key.startswith("_"):
                 entry[key] = val
 
-        return json.dumps(entry, ensure_ascii=False, default=str)
+        return _dumps(entry)
 
 
 def _setup_logger() -> logging.Logger:
@@ -118,11 +137,19 @@ def log_ctx(**kwargs) -> dict:
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 COGNITO_USER_POOL_ID = os.environ.get("COGNITO_USER_POOL_ID")
 COGNITO_CLIENT_ID = os.environ.get("COGNITO_CLIENT_ID")
+# Cognito issuer ve JWKS adresi açılışta bir kez hesaplanır (verify_jwt her çağrıda kurmaz)
+COGNITO_ISSUER = f"https://cognito-idp.{AWS_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}" if COGNITO_USER_POOL_ID else None
+COGNITO_JWKS_URL = f"{COGNITO_ISSUER}/.well-known/jwks.json" if COGNITO_ISSUER else None
 DB_HOST = os.environ.get("DB_HOST")
 DB_NAME = os.environ.get("DB_NAME")
 DB_USER = os.environ.get("DB_USER")
 DB_PASSWORD = os.environ.get("DB_PASSWORD")
 DB_PORT = os.environ.get("DB_PORT", "5432")
+# Bağlantı havuzu boyutu (ThreadedConnectionPool): DB_MINCONN açılışta kurulan, DB_MAXCONN üst sınır
+DB_MINCONN = int(os.environ.get("DB_MINCONN", "1"))
+DB_MAXCONN = int(os.environ.get("DB_MAXCONN", "25"))
+# Lambda zaman aşımının (30 sn) altında: kaçak sorgu bağlantıyı Lambda öldürülmeden bırakır
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", "25000"))
 S3_BUCKET_NAME = os.environ.get("S3_BUCKET_NAME")
 BEDROCK_MODEL_ID = os.environ.get("BEDROCK_MODEL_ID", "anthropic.claude-3-haiku-20240307-v1:0")
 AI_LAMBDA_FUNCTION_NAME = os.environ.get("AI_LAMBDA_FUNCTION_NAME", "lambda_ai")
@@ -143,12 +170,75 @@ LANGFUSE_HOST = os.environ.get("LANGFUSE_HOST", "https://cloud.langfuse.com")
 RUN_DB_MIGRATIONS_ON_START = True
 
 # ── AWS Clients ───────────────────────────────────────────────────
-s3_client = boto3.client("s3", region_name=AWS_REGION, config=Config(signature_version="s3v4"))
-cognito = boto3.client("cognito-idp", region_name=AWS_REGION)
-bedrock_runtime = boto3.client("bedrock-runtime", region_name=AWS_REGION)
-lambda_client = boto3.client("lambda", region_name=AWS_REGION)
-ssm_client = boto3.client("ssm", region_name=AWS_REGION)
-cw_client = boto3.client("cloudwatch", region_name=AWS_REGION)
+class _LazyClient:
+    """
+    boto3 client'ını ilk kullanımda oluşturan ince vekil.
+
+    Her client oluşturma endpoint çözümlemesi + credential zinciri demek; cold start'ta
+    altı client birden kurmak yerine yalnızca isteğin gerçekten kullandığı kurulur.
+    `from config import s3_client` aynen çalışır, çağrı noktaları değişmez.
+    """
+
+    __slots__ = ("_service", "_kwargs", "_client")
+
+    def __init__(self, service: str, **kwargs):
+        self._service = service
+        self._kwargs = kwargs
+        self._client = None
+
+    def __getattr__(self, name):
+        client = self._client
+        if client is None:
+            client = self._client = boto3.client(self._service, **self._kwargs)
+        return getattr(client, name)
+
+
+s3_client = _LazyClient("s3", region_name=AWS_REGION, config=Config(signature_version="s3v4"))
+cognito = _LazyClient("cognito-idp", region_name=AWS_REGION)
+bedrock_runtime = _LazyClient(
+    "bedrock-runtime", region_name=AWS_REGION,
+    config=Config(retries={"max_attempts": 2, "mode": "standard"}, tcp_keepalive=True),
+)
+lambda_client = _LazyClient("lambda", region_name=AWS_REGION)
+ssm_client = _LazyClient("ssm", region_name=AWS_REGION)
+cw_client = _LazyClient("cloudwatch", region_name=AWS_REGION)
+
+# ── SSM parametreleri ─────────────────────────────────────────────
+# "ssm:<ad>" biçimindeki gizli değerler ilk ihtiyaçta tek get_parameters çağrısıyla
+# topluca çekilir (DB şifresi + Langfuse anahtarları = 1 gidiş-dönüş) ve bellekte tutulur.
+_SSM_CACHE = {}
+_SSM_BATCH_LIMIT = 10  # get_parameters istek başına en fazla 10 ad kabul eder
+
+
+def prefetch_ssm(names):
+    pending = [n for n in dict.fromkeys(names) if n and n not in _SSM_CACHE]
+    for i in range(0, len(pending), _SSM_BATCH_LIMIT):
+        try:
+            resp = ssm_client.get_parameters(Names=pending[i:i + _SSM_BATCH_LIMIT], WithDecryption=True)
+        except ClientError as exc:
+            # ssm:GetParameters izni yoksa (AccessDenied) toplu çekim atlanır;
+            # resolve_secret eksik adları tek tek get_parameter ile çözer
+            logger.warning(f"SSM batch fetch failed, falling back to get_parameter: {exc}")
+            return
+        _SSM_CACHE.update({p["Name"]: p["Value"] for p in resp.get("Parameters", [])})
+
+
+def resolve_secret(value):
+    """
+    "ssm:" önekli değeri SSM'den çözer; önek yoksa değeri aynen döndürür.
+
+    İlk çağrıda ortamdaki tüm "ssm:" değerleri birlikte çekilir; bulunamayan ad için tek
+    get_parameter denenir (hata yukarı fırlatılır).
+    """
+    if not value or not value.startswith("ssm:"):
+        return value
+    name = value[4:]
+    if name not in _SSM_CACHE:
+        prefetch_ssm(v[4:] for v in (DB_PASSWORD, LANGFUSE_PUBLIC_KEY, LANGFUSE_SECRET_KEY, value)
+                     if v and v.startswith("ssm:"))
+    if name not in _SSM_CACHE:
+        _SSM_CACHE[name] = ssm_client.get_parameter(Name=name, WithDecryption=True)["Parameter"]["Value"]
+    return _SSM_CACHE[name]
 
 # ── Pricing ───────────────────────────────────────────────────────
 BEDROCK_INPUT_TOKEN_PRICE = float(os.environ.get("BEDROCK_INPUT_TOKEN_PRICE", "0.00000025"))
@@ -188,16 +278,8 @@ def get_langfuse():
     if langfuse_client is None:
         try:
             from langfuse import Langfuse
-            if LANGFUSE_PUBLIC_KEY and LANGFUSE_PUBLIC_KEY.startswith("ssm:"):
-                pk_val = ssm_client.get_parameter(
-                    Name=LANGFUSE_PUBLIC_KEY[4:], WithDecryption=True
-                )["Parameter"]["Value"]
-                sk_val = ssm_client.get_parameter(
-                    Name=LANGFUSE_SECRET_KEY[4:], WithDecryption=True
-                )["Parameter"]["Value"]
-            else:
-                pk_val = LANGFUSE_PUBLIC_KEY
-                sk_val = LANGFUSE_SECRET_KEY
+            pk_val = resolve_secret(LANGFUSE_PUBLIC_KEY)
+            sk_val = resolve_secret(LANGFUSE_SECRET_KEY)
             if pk_val and sk_val:
                 langfuse_client = Langfuse(public_key=pk_val, secret_key=sk_val, host=LANGFUSE_HOST)
             else:
@@ -1,11 +1,44 @@
+import atexit
+import weakref
+from contextlib import contextmanager
+
 import psycopg2
-from psycopg2 import pool
+from psycopg2 import extensions, pool
+from psycopg2.extras import execute_values
 
-from config import DB_HOST, DB_NAME, DB_PASSWORD, DB_PORT, DB_USER, RUN_DB_MIGRATIONS_ON_START, logger, ssm_client
+from config import (
+    DB_HOST, DB_MAXCONN, DB_MINCONN, DB_NAME, DB_PASSWORD, DB_PORT, DB_STATEMENT_TIMEOUT_MS, DB_USER,
+    RUN_DB_MIGRATIONS_ON_START, logger, resolve_secret,
+)
 
 db_pool = None
 migration_checked = False
 
+# Hot fixed-shape queries: PREPAREd once per pooled connection, then run via EXECUTE so Postgres
+# skips parse/plan on every call. Parameters use $n placeholders.
+# Grouped so that a schema problem in one area (e.g. receipts before the migration has run)
+# cannot stop the auth path from preparing its own statements.
+_USER_COLUMNS = "id, cognito_sub, email, full_name, created_at"
+PREPARED_STATEMENTS = {
+    "user": {
+        "user_by_id": f"SELECT {_USER_COLUMNS} FROM user_data WHERE id=$1",
+        "user_by_sub": f"SELECT {_USER_COLUMNS} FROM user_data WHERE cognito_sub=$1",
+        "user_id_by_sub": "SELECT id FROM user_data WHERE cognito_sub=$1",
+        "user_upsert": f"""INSERT INTO user_data (cognito_sub, email, full_name) VALUES ($1, $2, $3)
+            ON CONFLICT (cognito_sub)
+            DO UPDATE SET email = EXCLUDED.email, full_name = COALESCE(EXCLUDED.full_name, user_data.full_name)
+            RETURNING {_USER_COLUMNS}""",
+    },
+    "receipt": {
+        "receipt_by_id": """SELECT id, user_id, file_url, status, merchant_name, receipt_date, total_amount,
+            category_id, payment_method, description, created_at, updated_at
+            FROM receipts WHERE id=$1 AND user_id=$2""",
+        "receipt_items_by_receipt": """SELECT id, item_name, quantity, unit_price, total_price
+            FROM receipt_items WHERE receipt_id=$1 ORDER BY id ASC""",
+    },
+}
+_prepared_conns = weakref.WeakKeyDictionary()
+
 
 def init_db_pool():
     global db_pool, DB_PASSWORD
@@ -16,18 +49,38 @@ def init_db_pool():
     if actual_password and actual_password.startswith("ssm:"):
         logger.info("Fetching DB_PASSWORD from SSM Parameter Store")
         try:
-            resp = ssm_client.get_parameter(Name=actual_password[4:], WithDecryption=True)
-            actual_password = resp["Parameter"]["Value"]
+            actual_password = resolve_secret(actual_password)
         except Exception as e:
             logger.error(f"Failed to fetch DB password from SSM: {e}")
             raise RuntimeError("Secure database credential fetch failed.")
-    db_pool = psycopg2.pool.SimpleConnectionPool(
-        minconn=1, maxconn=8,
+    # The pool opens DB_MINCONN connections right here, so they are warm before the first query.
+    # TCP keepalives let idle connections in a frozen container be detected and dropped.
+    db_pool = psycopg2.pool.ThreadedConnectionPool(
+        minconn=DB_MINCONN, maxconn=max(DB_MINCONN, DB_MAXCONN),
         host=DB_HOST, database=DB_NAME, user=DB_USER,
         password=actual_password, port=DB_PORT, connect_timeout=8,
+        application_name="finance-backend",
+        keepalives=1, keepalives_idle=60, keepalives_interval=10, keepalives_count=3,
+        options=f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}",
     )
 
 
+def close_db_pool():
+    """Close every pooled connection; registered with atexit so shutdown doesn't leave sockets open."""
+    global db_pool
+    if db_pool is None:
+        return
+    try:
+        db_pool.closeall()
+    except Exception as exc:
+        logger.warning(f"DB pool close failed: {exc}")
+    db_pool = None
+    _prepared_conns.clear()
+
+
+atexit.register(close_db_pool)
+
+
 def get_db_connection():
     if db_pool is None:
         init_db_pool()
@@ -39,13 +92,71 @@ def release_db_connection(conn):
         db_pool.putconn(conn)
 
 
+def ensure_prepared(conn, group="user"):
+    """
+    PREPARE the statements of PREPARED_STATEMENTS[group] on this connection if not done yet.
+
+    PREPARE is session-scoped and survives a rollback, so names already in pg_prepared_statements
+    are skipped. If preparing fails the connection is rolled back and closed; the pool then
+    discards it on release instead of handing out a half-prepared session.
+    """
+    done = _prepared_conns.setdefault(conn, set())
+    if group in done:
+        return
+    statements = PREPARED_STATEMENTS[group]
+    was_idle = conn.info.transaction_status == extensions.TRANSACTION_STATUS_IDLE
+    try:
+        with conn.cursor(cursor_factory=None) as cur:
+            cur.execute("SELECT name FROM pg_prepared_statements WHERE name = ANY(%s)", (list(statements),))
+            existing = {row[0] for row in cur.fetchall()}
+            for name, sql in statements.items():
+                if name not in existing:
+                    cur.execute(f"PREPARE {name} AS {sql}")
+        if was_idle:
+            conn.commit()
+    except Exception:
+        _prepared_conns.pop(conn, None)
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        conn.close()
+        raise
+    done.add(group)
+
+
+def bulk_insert(cur, sql, rows, page_size=200, fetch=False, template=None):
+    """
+    Multi-row INSERT via execute_values: one statement per page_size rows instead of one per row.
+
+    sql takes a single VALUES %s placeholder, e.g.
+    bulk_insert(cur, "INSERT INTO receipt_items (receipt_id, item_name, total_price) VALUES %s", rows)
+    With fetch=True the RETURNING rows of every page are collected and returned. template
+    overrides the per-row snippet, e.g. "(%s::uuid, %s)" to type the columns of a VALUES list.
+    """
+    if not rows:
+        return [] if fetch else None
+    return execute_values(cur, sql, rows, template=template, page_size=page_size, fetch=fetch)
+
+
+@contextmanager
+def pooled_conn(cursor_factory=None):
+    """Borrow a pooled connection, yield (conn, cur) and always hand the connection back."""
+    conn = get_db_connection()
+    try:
+        with conn.cursor(cursor_factory=cursor_factory) as cur:
+            yield conn, cur
+    finally:
+        release_db_connection(conn)
+
+
 def maybe_run_migrations_once():
     global migration_checked
     if migration_checked or not RUN_DB_MIGRATIONS_ON_START:
         return
     try:
         from migrations import ensure_tables_exist
-        ensure_tables_exist()
-        migration_checked = True
+        # A failed check is not marked done, so the next request retries it
+        migration_checked = bool(ensure_tables_exist())
     except Exception as exc:
         logger.error(f"Migration check failed: {exc}")
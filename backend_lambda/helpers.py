@@ -1,9 +1,24 @@
+import atexit
 import calendar
 import decimal
 import hashlib
 import json
 import re
-from datetime import date, datetime
+import threading
+import time
+from bisect import bisect_right
+from datetime import date, datetime, timezone
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # orjson yoksa stdlib json kullanılır
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # opsiyonel hızlandırma; yoksa anahtar kelime döngüsü kullanılır
+    ahocorasick = None
 
 from config import (
     ALLOWED_ORIGIN, BEDROCK_INPUT_TOKEN_PRICE, BEDROCK_OUTPUT_TOKEN_PRICE,
@@ -11,25 +26,50 @@ from config import (
     bedrock_runtime, cw_client, logger, s3_client,
 )
 
+_PERIOD_RE = re.compile(r"(\d{4})-(\d{2})")
+_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+
+
+_TR_TABLE = str.maketrans({
+    "İ": "i", "I": "i", "ı": "i", "Ş": "s", "ş": "s",
+    "Ç": "c", "ç": "c", "Ğ": "g", "ğ": "g",
+    "Ü": "u", "ü": "u", "Ö": "o", "ö": "o",
+})
+
+
+@lru_cache(maxsize=4096)
+def _normalize_str(text):
+    return text.strip().translate(_TR_TABLE).lower()
+
 
 def _normalize_text(value):
     if value is None:
         return ""
-    text = str(value).strip()
-    replacements = {
-        "İ": "i", "I": "i", "ı": "i", "Ş": "s", "ş": "s",
-        "Ç": "c", "ç": "c", "Ğ": "g", "ğ": "g",
-        "Ü": "u", "ü": "u", "Ö": "o", "ö": "o",
-    }
-    for src, target in replacements.items():
-        text = text.replace(src, target)
-    return text.lower()
+    # Cache anahtarı her zaman str olur; body'den gelen liste/dict gibi değerler de güvenli
+    return _normalize_str(value if isinstance(value, str) else str(value))
 
 
 CATEGORY_NAME_TO_ID = {_normalize_text(name): cid for cid, name in CATEGORIES.items()}
+_CATEGORY_ALIASES = {
+    "ulasim": 7, "online alisveris": 4, "diger": 8,
+    "saglik": 8, "eglence": 8, "giyim": 8, "teknoloji": 4,
+}
+# Normalize edilmiş kategori adı veya takma ad -> id; gerçek adlar takma adlardan önceliklidir
+_CATEGORY_LOOKUP = {**_CATEGORY_ALIASES, **CATEGORY_NAME_TO_ID}
+
+
+# Sık gelen tipler için tek sözlük araması; alt sınıflar aşağıdaki isinstance zincirine düşer
+_JSON_DEFAULTS = {
+    datetime: datetime.isoformat,
+    date: date.isoformat,
+    decimal.Decimal: float,
+}
 
 
 def _json_default(value):
+    fn = _JSON_DEFAULTS.get(type(value))
+    if fn is not None:
+        return fn(value)
     if isinstance(value, (datetime, date)):
         return value.isoformat()
     if isinstance(value, decimal.Decimal):
@@ -37,21 +77,54 @@ def _json_default(value):
     return str(value)
 
 
+# Tüm yanıtlarda aynı sözlük paylaşılır; yerinde değiştirmeyin (farklı başlık gerekirse kopyalayın)
+_RESPONSE_HEADERS = {
+    "Content-Type": "application/json; charset=utf-8",
+    "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
+    "Access-Control-Allow-Headers": "Content-Type,Authorization",
+    "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
+    "X-Content-Type-Options": "nosniff",
+    "Cache-Control": "no-store",
+}
+
+
 def api_response(status_code, body):
     return {
         "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json; charset=utf-8",
-            "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
-            "Access-Control-Allow-Headers": "Content-Type,Authorization",
-            "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
-            "X-Content-Type-Options": "nosniff",
-            "Cache-Control": "no-store",
-        },
-        "body": json.dumps(body, default=_json_default, ensure_ascii=False),
+        "headers": _RESPONSE_HEADERS,
+        "body": _dumps_body(body),
     }
 
 
+def _dumps_body(body):
+    if orjson is not None:
+        try:
+            # datetime/date/UUID orjson'da yerleşik; Decimal vb. _json_default'a düşer
+            return orjson.dumps(body, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass  # >64-bit int gibi orjson'un yazamadığı değerler — stdlib her şeyi yazabilir
+    return json.dumps(body, default=_json_default, ensure_ascii=False)
+
+
+def _json_dumps(value):
+    # Bedrock gövdeleri ve pgvector parametreleri için; çıktı stdlib ile aynı JSON'dur
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=_json_default).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(value, default=_json_default)
+
+
+def _json_loads(data):
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity, >64-bit int gibi stdlib'in kabul ettiği girdiler
+    return json.loads(data)
+
+
 def _safe_float(value, default=0.0):
     if value is None:
         return default
@@ -83,6 +156,9 @@ def _get_header(headers, key):
     if key in headers:
         return headers.get(key) or ""
     key_lower = key.lower()
+    # HTTP API (payload v2) başlıkları zaten küçük harfle gönderir: tarama yapmadan bul
+    if key_lower in headers:
+        return headers.get(key_lower) or ""
     for h_key, h_val in headers.items():
         if (h_key or "").lower() == key_lower:
             return h_val or ""
@@ -96,28 +172,31 @@ def _hash_token(token):
 def _parse_period(period):
     if not period or not isinstance(period, str):
         return datetime.now().strftime("%Y-%m")
-    if re.match(r"^\d{4}-\d{2}$", period):
+    if _PERIOD_RE.fullmatch(period):
         return period
     return datetime.now().strftime("%Y-%m")
 
 
-def _period_bounds(period):
-    period = _parse_period(period)
+@lru_cache(maxsize=512)
+def _month_bounds(period):
+    """Geçerli "YYYY-MM" için (ayın ilk günü, son günü, son gün sayısı); ay başına bir kez hesaplanır."""
     year = int(period[:4])
     month = int(period[5:7])
-    start_date = date(year, month, 1)
     last_day = calendar.monthrange(year, month)[1]
-    end_date = date(year, month, last_day)
+    return date(year, month, 1), date(year, month, last_day), last_day
+
+
+def _period_bounds(period):
+    # Geçersiz/boş girdi "bu ay"a döner; bu yüzden cache normalize edilmiş period üzerinden
+    period = _parse_period(period)
+    start_date, end_date, _ = _month_bounds(period)
     return period, start_date, end_date
 
 
 def _resolve_due_date_for_period(period, due_day):
-    period, _, _ = _period_bounds(period)
-    year = int(period[:4])
-    month = int(period[5:7])
-    last_day = calendar.monthrange(year, month)[1]
+    start_date, _, last_day = _month_bounds(_parse_period(period))
     due_day = max(1, min(int(due_day or 1), last_day))
-    return date(year, month, due_day)
+    return start_date.replace(day=due_day)
 
 
 def _resolve_category_id(raw_category_id=None, raw_category_name=None, merchant_name=None):
@@ -130,21 +209,105 @@ def _resolve_category_id(raw_category_id=None, raw_category_name=None, merchant_
             pass
     normalized = _normalize_text(raw_category_name)
     if normalized:
-        mapped = CATEGORY_NAME_TO_ID.get(normalized)
+        mapped = _CATEGORY_LOOKUP.get(normalized)
         if mapped:
             return mapped
-        for cid, label in CATEGORIES.items():
-            if _normalize_text(label) == normalized:
-                return cid
-        alias_map = {
-            "ulasim": 7, "online alisveris": 4, "diger": 8,
-            "saglik": 8, "eglence": 8, "giyim": 8, "teknoloji": 4,
-        }
-        if normalized in alias_map:
-            return alias_map[normalized]
     return _determine_category(merchant_name or "")
 
 
+def _build_keyword_index(category_keywords):
+    """
+    Anahtar kelime -> kategori demeti eşlemesi kurar (ör. "spotify" -> (5, 9)).
+
+    Aynı kelime birden fazla kategoride geçebilir; demetin ilk elemanı CATEGORY_KEYWORDS
+    sırasına göre önceliklidir ve eşleşmede o kategori seçilir. Eşleme sırası da kategori
+    sırasını izler, böylece her kelime metinde yalnızca bir kez aranır.
+    """
+    keyword_to_categories = {}
+    for cat_id, keywords in category_keywords.items():
+        for kw in keywords:
+            if kw:
+                keyword_to_categories.setdefault(kw, []).append(cat_id)
+    return {kw: tuple(cats) for kw, cats in keyword_to_categories.items()}
+
+
+_KEYWORD_TO_CATEGORIES = _build_keyword_index(CATEGORY_KEYWORDS)
+
+
+def _build_keyword_automaton(keyword_to_categories):
+    """
+    Tüm kategori anahtar kelimelerinden tek bir Aho-Corasick otomatı kurar.
+
+    Her kelimeye (öncelik, kategori) eşlenir; öncelik kelimenin eşlemedeki sırasıdır. Metin
+    tek geçişte taranır, en öncelikli eşleşen kategori seçilir — eski "sırayla her listeyi
+    tara" davranışıyla birebir aynı sonuç. pyahocorasick yoksa None döner ve döngüye düşülür.
+    """
+    if ahocorasick is None or not keyword_to_categories:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, (kw, cats) in enumerate(keyword_to_categories.items()):
+        automaton.add_word(kw, (rank, cats[0]))
+    automaton.make_automaton()
+    return automaton
+
+
+_CATEGORY_AUTOMATON = _build_keyword_automaton(_KEYWORD_TO_CATEGORIES)
+
+# Fiş kalemi adından kategori tahmini (mekan adı eşleşmediğinde); sıra öncelik sırasıdır
+_ITEM_KEYWORDS = {
+    1: ["bira", "rakı", "viski", "vodka", "ekmek"],
+    2: ["iskender", "kuver", "servis ücreti", "kebap"],
+    7: ["benzin", "motorin", "dizel", "lpg"],
+    5: ["fatura", "aidat"],
+}
+_ITEM_KEYWORD_TO_CATEGORIES = _build_keyword_index(_ITEM_KEYWORDS)
+_ITEM_AUTOMATON = _build_keyword_automaton(_ITEM_KEYWORD_TO_CATEGORIES)
+
+
+def _match_keywords(text, keyword_to_categories, automaton):
+    if automaton is None:
+        for kw, cats in keyword_to_categories.items():
+            if kw in text:
+                return cats[0]
+        return None
+    best_rank, best_cat = None, None
+    for _, (rank, cat_id) in automaton.iter(text):
+        if best_rank is None or rank < best_rank:
+            best_rank, best_cat = rank, cat_id
+            if rank == 0:
+                break
+    return best_cat
+
+
+def _match_item_keywords(item_names):
+    """
+    İlk eşleşen kalemin kategorisi (kalem içinde grup önceliği geçerli).
+
+    Otomat varsa tüm kalemler "\n" ile birleştirilip tek geçişte taranır; eşleşmenin bittiği
+    konumdan hangi kaleme ait olduğu bulunur. Anahtar kelimeler "\n" içermediği için iki
+    kalemi aşan eşleşme oluşmaz.
+    """
+    if _ITEM_AUTOMATON is None:
+        for name in item_names:
+            matched = _match_keywords(name, _ITEM_KEYWORD_TO_CATEGORIES, None)
+            if matched is not None:
+                return matched
+        return None
+    bounds, pos = [], 0
+    for name in item_names:
+        pos += len(name)
+        bounds.append(pos)  # kalemin bitişi (ayraç konumu)
+        pos += 1
+    best_item, best_rank, best_cat = None, None, None
+    for end, (rank, cat_id) in _ITEM_AUTOMATON.iter("\n".join(item_names)):
+        item_idx = bisect_right(bounds, end)
+        if best_item is not None and item_idx != best_item:
+            break  # eşleşmeler bitiş konumuna göre sıralı: sonraki kalemlere geçildi
+        if best_rank is None or rank < best_rank:
+            best_item, best_rank, best_cat = item_idx, rank, cat_id
+    return best_cat
+
+
 def _determine_category(merchant_name, items=None, ai_suggested_id=None):
     if ai_suggested_id:
         try:
@@ -154,31 +317,32 @@ def _determine_category(merchant_name, items=None, ai_suggested_id=None):
         except Exception:
             pass
     text = (merchant_name or "").lower()
-    for cat_id, keywords in CATEGORY_KEYWORDS.items():
-        if any(kw in text for kw in keywords):
-            return cat_id
-    for item in (items or []):
-        item_name = (item.get("name") or "").lower()
-        if any(x in item_name for x in ["bira", "rakı", "viski", "vodka", "ekmek"]):
-            return 1
-        if any(x in item_name for x in ["iskender", "kuver", "servis ücreti", "kebap"]):
-            return 2
-        if any(x in item_name for x in ["benzin", "motorin", "dizel", "lpg"]):
-            return 7
-        if any(x in item_name for x in ["fatura", "aidat"]):
-            return 5
+    matched = _match_keywords(text, _KEYWORD_TO_CATEGORIES, _CATEGORY_AUTOMATON)
+    if matched is not None:
+        return matched
+    if items:
+        matched = _match_item_keywords([(item.get("name") or "").lower() for item in items])
+        if matched is not None:
+            return matched
     return 8
 
 
+# Aynı anahtar için imzalı URL dakika kovası boyunca yeniden kullanılır; 300 sn
+# geçerlilikten en fazla 60 sn yenir, URL en az 4 dk daha geçerli kalır.
+@lru_cache(maxsize=1024)
+def _presign_cached(s3_key, _minute_bucket):
+    return s3_client.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": S3_BUCKET_NAME, "Key": s3_key},
+        ExpiresIn=300,
+    )
+
+
 def _build_receipt_image_url(s3_key):
     if not s3_key or str(s3_key).startswith("manual/"):
         return None
     try:
-        return s3_client.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": S3_BUCKET_NAME, "Key": s3_key},
-            ExpiresIn=300,
-        )
+        return _presign_cached(str(s3_key), int(time.time()) // 60)
     except Exception:
         return None
 
@@ -186,53 +350,85 @@ def _build_receipt_image_url(s3_key):
 def _fix_date(date_str):
     if not date_str or not isinstance(date_str, str):
         return None
-    m = re.match(r"^(\d{4})-(\d{2})-(\d{2})$", date_str)
+    m = _DATE_RE.fullmatch(date_str)
     if not m:
         return None
     y, mo, d = map(int, m.groups())
     if mo < 1: mo = 1
     if mo > 12: mo = 12
     if d < 1: d = 1
-    if d > 31: d = 31
-    for _ in range(4):
-        try:
-            return date(y, mo, d).isoformat()
-        except ValueError:
-            d -= 1
-            if d < 1:
-                return None
-    return None
+    last_day = calendar.monthrange(y, mo)[1]
+    if d > last_day: d = last_day
+    try:
+        return date(y, mo, d).isoformat()
+    except ValueError:  # yıl 0 gibi date() aralığı dışı değerler
+        return None
+
+
+# Bedrock metrikleri istek boyunca biriktirilir; lambda_handler sonunda flush_metrics()
+# ile tek put_metric_data çağrısında gönderilir (OCR + embedding = 1 çağrı, 2 değil).
+_METRIC_NAMESPACE = "ParamNerede/Bedrock"
+_METRIC_FLUSH_SIZE = 20
+_METRIC_BUF = []
+_METRIC_LOCK = threading.Lock()
+
+
+def flush_metrics():
+    with _METRIC_LOCK:
+        if not _METRIC_BUF:
+            return
+        batch = _METRIC_BUF[:]
+        _METRIC_BUF.clear()
+    try:
+        cw_client.put_metric_data(Namespace=_METRIC_NAMESPACE, MetricData=batch)
+    except Exception as e:
+        logger.warning(f"Failed to emit Bedrock metrics: {e}")
 
 
 def emit_bedrock_metrics(endpoint, input_tokens, output_tokens):
     try:
         cost = (input_tokens * BEDROCK_INPUT_TOKEN_PRICE) + (output_tokens * BEDROCK_OUTPUT_TOKEN_PRICE)
-        cw_client.put_metric_data(
-            Namespace="ParamNerede/Bedrock",
-            MetricData=[
-                {"MetricName": "InputTokens", "Value": input_tokens, "Unit": "Count", "Dimensions": [{"Name": "Endpoint", "Value": endpoint}]},
-                {"MetricName": "OutputTokens", "Value": output_tokens, "Unit": "Count", "Dimensions": [{"Name": "Endpoint", "Value": endpoint}]},
-                {"MetricName": "EstimatedCost", "Value": cost, "Unit": "None", "Dimensions": [{"Name": "Endpoint", "Value": endpoint}]},
-            ]
-        )
+        ts = datetime.now(timezone.utc)
+        dims = [{"Name": "Endpoint", "Value": endpoint}]
+        with _METRIC_LOCK:
+            _METRIC_BUF.extend((
+                {"MetricName": "InputTokens", "Value": input_tokens, "Unit": "Count", "Timestamp": ts, "Dimensions": dims},
+                {"MetricName": "OutputTokens", "Value": output_tokens, "Unit": "Count", "Timestamp": ts, "Dimensions": dims},
+                {"MetricName": "EstimatedCost", "Value": cost, "Unit": "None", "Timestamp": ts, "Dimensions": dims},
+            ))
+            full = len(_METRIC_BUF) >= _METRIC_FLUSH_SIZE
+        if full:
+            flush_metrics()
     except Exception as e:
         logger.warning(f"Failed to emit Bedrock metrics: {e}")
 
 
+atexit.register(flush_metrics)
+
+
+# 1024 float'lık vektör ~33 KB; 128 kayıt Lambda belleğinde ~4 MB'ı geçmez
+@lru_cache(maxsize=128)
+def _embedding_for(text):
+    payload = {"inputText": text, "dimensions": 1024, "normalize": True}
+    resp = bedrock_runtime.invoke_model(
+        modelId=TITAN_EMBEDDING_MODEL_ID,
+        body=_json_dumps(payload),
+        accept="application/json",
+        contentType="application/json"
+    )
+    resp_body = _json_loads(resp["body"].read())
+    emit_bedrock_metrics("embedding", resp_body.get("inputTextTokenCount", 0), 0)
+    embedding = resp_body.get("embedding")
+    if not embedding:
+        raise ValueError("Empty embedding in Bedrock response")  # boş sonuç cache'lenmez
+    return tuple(embedding)
+
+
 def get_text_embedding(text):
     if not text or not isinstance(text, str):
         return None
     try:
-        payload = {"inputText": text[:8000], "dimensions": 1024, "normalize": True}
-        resp = bedrock_runtime.invoke_model(
-            modelId=TITAN_EMBEDDING_MODEL_ID,
-            body=json.dumps(payload),
-            accept="application/json",
-            contentType="application/json"
-        )
-        resp_body = json.loads(resp["body"].read())
-        emit_bedrock_metrics("embedding", resp_body.get("inputTextTokenCount", 0), 0)
-        return resp_body.get("embedding")
+        return list(_embedding_for(text[:8000]))
     except Exception as exc:
         logger.error(f"Embedding generation failed: {exc}", exc_info=True)
         return None
@@ -30,11 +30,19 @@ CloudWatch Logs Insights — kullanıcıya özel debug sorgusu:
 
 import base64
 import json
+import re
 import time
+from functools import lru_cache
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson yoksa stdlib json kullanılır
+    _json_loads = json.loads
 
 from config import log_ctx, logger
-from db import get_db_connection, maybe_run_migrations_once, release_db_connection
-from helpers import _get_header, api_response
+from db import ensure_prepared, get_db_connection, maybe_run_migrations_once, release_db_connection
+from helpers import _get_header, api_response, flush_metrics
 
 # ── Auth ──────────────────────────────────────────────────────────
 from auth import (
@@ -95,6 +103,10 @@ from routes.dashboard import handle_dashboard
 from routes.export import handle_export_data
 from routes.chat import handle_ai_chat
 
+# Şema kontrolü Lambda init aşamasında denenir. Hata loglanır ve import'u bozmaz;
+# başarısız olursa lambda_handler her istekte (ucuz bayrak kontrolüyle) yeniden dener.
+maybe_run_migrations_once()
+
 
 # ══════════════════════════════════════════════════════════════════
 #  Internal Helpers
@@ -105,13 +117,16 @@ def _parse_body(event: dict) -> dict:
     raw = event.get("body")
     if not raw:
         return {}
+    if isinstance(raw, dict):
+        return raw
     if event.get("isBase64Encoded"):
         try:
-            raw = base64.b64decode(raw).decode("utf-8")
+            raw = base64.b64decode(raw)
         except Exception:
-            pass
+            return {}
     try:
-        return json.loads(raw) if isinstance(raw, str) else raw
+        # str ve UTF-8 bytes doğrudan parse edilir; ara str kopyası gerekmez
+        return _json_loads(raw)
     except Exception:
         return {}
 
@@ -128,36 +143,161 @@ def _extract_request_meta(event: dict) -> tuple:
     return method, (path.rstrip("/") or "/")
 
 
-def _resolve_user_id(claims: dict, request_id: str) -> tuple:
+@lru_cache(maxsize=2048)
+def _user_id_for_sub(cognito_sub: str) -> int:
     """
-    Cognito claims'ten DB user_id çözer.
-    Returns: (user_id, cognito_sub)
+    cognito_sub -> DB user_id; sıcak container'da her istekte DB'ye gidilmez.
+    Kayıt yoksa LookupError fırlatır (hatalar cache'lenmez).
     """
-    cognito_sub = claims.get("sub", "-")
     conn = get_db_connection()
     try:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT id FROM user_data WHERE cognito_sub = %s",
-                (cognito_sub,),
-            )
+        ensure_prepared(conn)
+        # Düz tuple cursor; yalnızca id gerekiyor
+        with conn.cursor(cursor_factory=None) as cur:
+            cur.execute("EXECUTE user_id_by_sub(%s)", (cognito_sub,))
             row = cur.fetchone()
-            if row:
-                return row[0], cognito_sub
-            # Ilk giris — kullanici kaydi yarat
-            user = _ensure_user_record(claims)
-            logger.info(
-                "New user record created",
-                extra=log_ctx(
-                    request_id=request_id,
-                    user_id=user["id"],
-                    cognito_sub=cognito_sub,
-                    module_name="lambda_function",
-                ),
-            )
-            return user["id"], cognito_sub
     finally:
         release_db_connection(conn)
+    if not row:
+        raise LookupError(cognito_sub)
+    return row[0]
+
+
+def _resolve_user_id(claims: dict, request_id: str) -> tuple:
+    """
+    Cognito claims'ten DB user_id çözer.
+    Returns: (user_id, cognito_sub)
+    """
+    cognito_sub = claims.get("sub", "-")
+    try:
+        return _user_id_for_sub(cognito_sub), cognito_sub
+    except LookupError:
+        pass
+    # Ilk giris — kullanici kaydi yarat
+    user = _ensure_user_record(claims)
+    logger.info(
+        "New user record created",
+        extra=log_ctx(
+            request_id=request_id,
+            user_id=user["id"],
+            cognito_sub=cognito_sub,
+            module_name="lambda_function",
+        ),
+    )
+    return user["id"], cognito_sub
+
+
+# ══════════════════════════════════════════════════════════════════
+#  Routing Tables
+# ══════════════════════════════════════════════════════════════════
+# Modül yüklenirken bir kez kurulur: sabit yollar tek dict araması, parametreli
+# yollar önceden derlenmiş regex ile eşlenir.
+
+# (method, path) -> (log mesajı, handler(body)) — JWT gerekmez
+_PUBLIC_ROUTES = {
+    ("POST", "/auth/login"): ("Auth login attempt", handle_auth_login),
+    ("POST", "/auth/register"): ("Auth register attempt", handle_auth_register),
+    ("POST", "/auth/confirm"): ("Auth confirm attempt", handle_auth_confirm),
+    ("POST", "/auth/refresh"): ("Auth token refresh", handle_auth_refresh),
+}
+
+# (method, path) -> handler(user_id, body, qsp)
+_STATIC_ROUTES = {
+    ("GET", "/auth/me"): lambda uid, body, qsp: handle_auth_me(uid),
+    ("GET", "/dashboard"): lambda uid, body, qsp: handle_dashboard(uid),
+    ("POST", "/analyze"): lambda uid, body, qsp: handle_ai_analyze(uid, body),
+    # Receipts
+    ("GET", "/receipts"): lambda uid, body, qsp: handle_receipts_list(uid, qsp),
+    ("POST", "/receipts/manual"): lambda uid, body, qsp: handle_manual_receipt_create(uid, body),
+    ("POST", "/receipts/upload"): lambda uid, body, qsp: handle_upload_init(uid, body),
+    ("POST", "/receipts/smart-extract"): lambda uid, body, qsp: handle_smart_extract(uid, body),
+    # Fixed Expenses
+    ("GET", "/fixed-expenses"): lambda uid, body, qsp: handle_fixed_expenses_get(uid, qsp),
+    ("POST", "/fixed-expenses/groups"): lambda uid, body, qsp: handle_fixed_expense_group_create(uid, body),
+    ("POST", "/fixed-expenses/items"): lambda uid, body, qsp: handle_fixed_expense_item_create(uid, body),
+    # Budgets
+    ("GET", "/budgets"): lambda uid, body, qsp: handle_get_budgets(uid),
+    ("POST", "/budgets"): lambda uid, body, qsp: handle_set_budget(uid, body),
+    # Goals
+    ("GET", "/goals"): lambda uid, body, qsp: handle_goals(uid, "GET", body),
+    ("POST", "/goals"): lambda uid, body, qsp: handle_goals(uid, "POST", body),
+    # Insights
+    ("GET", "/insights/overview"): lambda uid, body, qsp: handle_insights_overview(uid, qsp),
+    ("GET", "/insights/what-if"): lambda uid, body, qsp: handle_insights_what_if(uid, qsp),
+    # AI Actions
+    ("GET", "/ai-actions"): lambda uid, body, qsp: handle_ai_actions(uid, "GET", body, None, qsp),
+    ("POST", "/ai-actions"): lambda uid, body, qsp: handle_ai_actions(uid, "POST", body, None, qsp),
+    # Export
+    ("GET", "/export"): lambda uid, body, qsp: handle_export_data(uid),
+    # Reports
+    ("GET", "/reports/summary"): lambda uid, body, qsp: handle_reports_summary(uid, qsp),
+    ("GET", "/reports/chart"): lambda uid, body, qsp: handle_chart_data(uid, qsp),
+    ("GET", "/reports/detailed"): lambda uid, body, qsp: handle_reports_detailed(uid, qsp),
+    ("GET", "/reports/ai-summary"): lambda uid, body, qsp: handle_reports_ai_summary(uid, qsp),
+    ("POST", "/reports/ai-feedback"): lambda uid, body, qsp: handle_reports_ai_feedback(uid, body),
+    # Chat
+    ("POST", "/chat"): lambda uid, body, qsp: handle_ai_chat(uid, body),
+}
+
+# (pattern, izinli metodlar — None: hepsi, handler(user_id, method, body, qsp, **path_params))
+# Eski if/elif yönlendiricisi gibi kimlikten sonraki fazladan segmentler yok sayılır (_TAIL),
+# sıralama da onunla aynıdır: ilk eşleşen kazanır.
+_TAIL = r"(?:/.*)?$"
+_PARAM_ROUTES = [
+    # Receipts
+    (re.compile(r"^/receipts/(?P<receipt_id>[^/]+)/process" + _TAIL), {"POST"},
+     lambda uid, method, body, qsp, receipt_id: handle_receipt_process(uid, receipt_id)),
+    (re.compile(r"^/receipts/(?P<receipt_id>[^/]+)/items(?:/(?P<item_id>[^/]*)(?:/.*)?)?$"), None,
+     lambda uid, method, body, qsp, receipt_id, item_id: handle_receipt_items(uid, receipt_id, method, body, item_id or None)),
+    (re.compile(r"^/receipts/(?P<receipt_id>[^/]+)" + _TAIL), {"GET"},
+     lambda uid, method, body, qsp, receipt_id: handle_receipt_detail(uid, receipt_id)),
+    (re.compile(r"^/receipts/(?P<receipt_id>[^/]+)" + _TAIL), {"PUT"},
+     lambda uid, method, body, qsp, receipt_id: handle_receipt_update(uid, receipt_id, body)),
+    (re.compile(r"^/receipts/(?P<receipt_id>[^/]+)" + _TAIL), {"DELETE"},
+     lambda uid, method, body, qsp, receipt_id: handle_receipt_delete(uid, receipt_id)),
+    # Fixed Expenses
+    (re.compile(r"^/fixed-expenses/groups/(?P<group_id>[^/]+)" + _TAIL), {"PUT"},
+     lambda uid, method, body, qsp, group_id: handle_fixed_expense_group_update(uid, group_id, body)),
+    (re.compile(r"^/fixed-expenses/groups/(?P<group_id>[^/]+)" + _TAIL), {"DELETE"},
+     lambda uid, method, body, qsp, group_id: handle_fixed_expense_group_delete(uid, group_id)),
+    (re.compile(r"^/fixed-expenses/items/(?P<item_id>[^/]+)/payments?" + _TAIL), {"POST"},
+     lambda uid, method, body, qsp, item_id: handle_fixed_expense_payment_upsert(uid, item_id, body)),
+    (re.compile(r"^/fixed-expenses/items/(?P<item_id>[^/]+)" + _TAIL), {"PUT"},
+     lambda uid, method, body, qsp, item_id: handle_fixed_expense_item_update(uid, item_id, body)),
+    (re.compile(r"^/fixed-expenses/items/(?P<item_id>[^/]+)" + _TAIL), {"DELETE"},
+     lambda uid, method, body, qsp, item_id: handle_fixed_expense_item_delete(uid, item_id)),
+    # Budgets
+    (re.compile(r"^/budgets/(?P<budget_id>[^/]+)" + _TAIL), {"DELETE"},
+     lambda uid, method, body, qsp, budget_id: handle_delete_budget(uid, budget_id)),
+    # Subscriptions
+    (re.compile(r"^/subscriptions(?:/(?P<sub_id>[^/]*)(?:/.*)?)?$"), None,
+     lambda uid, method, body, qsp, sub_id: handle_subscriptions(uid, method, body, sub_id or None)),
+    # Goals
+    (re.compile(r"^/goals/(?P<goal_id>[^/]+)" + _TAIL), {"PUT", "DELETE"},
+     lambda uid, method, body, qsp, goal_id: handle_goals(uid, method, body, goal_id)),
+    # AI Actions
+    (re.compile(r"^/ai-actions/(?P<action_id>[^/]+)/apply" + _TAIL), {"POST"},
+     lambda uid, method, body, qsp, action_id: handle_ai_action_apply(uid, action_id, body)),
+    (re.compile(r"^/ai-actions/(?P<action_id>[^/]+)" + _TAIL), {"PUT", "PATCH", "DELETE"},
+     lambda uid, method, body, qsp, action_id: handle_ai_actions(uid, method, body, action_id, qsp)),
+    # Incomes
+    (re.compile(r"^/incomes(?:/(?P<income_id>[^/]*)(?:/.*)?)?$"), None,
+     lambda uid, method, body, qsp, income_id: handle_incomes(uid, method, body, income_id or None)),
+]
+
+
+def _dispatch(method: str, path: str, user_id, body: dict, qsp: dict):
+    """Korumalı route'u tablodan bulup çalıştırır; eşleşme yoksa None döner (404)."""
+    handler = _STATIC_ROUTES.get((method, path))
+    if handler:
+        return handler(user_id, body, qsp)
+    for pattern, methods, handler in _PARAM_ROUTES:
+        if methods is not None and method not in methods:
+            continue
+        match = pattern.match(path)
+        if match:
+            return handler(user_id, method, body, qsp, **match.groupdict())
+    return None
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -182,17 +322,17 @@ def lambda_handler(event: dict, context) -> dict:
 
     method, path = _extract_request_meta(event)
 
-    # Temel istek logu — user_id henüz bilinmiyor
-    logger.info(
-        "Request received",
-        extra=log_ctx(
-            request_id=request_id,
-            method=method,
-            path=path,
-            module_name="lambda_function",
-        ),
+    # Bir kez kurulur; sonraki loglar gerekirse yalnızca ek alanlarla kopyalar
+    base_ctx = log_ctx(
+        request_id=request_id,
+        method=method,
+        path=path,
+        module_name="lambda_function",
     )
 
+    # Temel istek logu — user_id henüz bilinmiyor
+    logger.info("Request received", extra=base_ctx)
+
     try:
         # ── OPTIONS (CORS pre-flight) ──────────────────────────────
         if method == "OPTIONS":
@@ -202,23 +342,14 @@ def lambda_handler(event: dict, context) -> dict:
         qsp = event.get("queryStringParameters") or {}
 
         # ── Public Auth Endpoints (JWT gerekmez) ───────────────────
-        _ctx = log_ctx(request_id=request_id, method=method, path=path, module_name="auth")
-
-        if path == "/auth/login" and method == "POST":
-            logger.info("Auth login attempt", extra=_ctx)
-            return handle_auth_login(body)
-
-        if path == "/auth/register" and method == "POST":
-            logger.info("Auth register attempt", extra=_ctx)
-            return handle_auth_register(body)
-
-        if path == "/auth/confirm" and method == "POST":
-            logger.info("Auth confirm attempt", extra=_ctx)
-            return handle_auth_confirm(body)
-
-        if path == "/auth/refresh" and method == "POST":
-            logger.info("Auth token refresh", extra=_ctx)
-            return handle_auth_refresh(body)
+        public_route = _PUBLIC_ROUTES.get((method, path))
+        if public_route:
+            log_message, handler = public_route
+            logger.info(
+                log_message,
+                extra={**base_ctx, "module_name": "auth"},
+            )
+            return handler(body)
 
         # ── JWT Dogrulama ─────────────────────────────────────────
         auth_header = _get_header(event.get("headers") or {}, "Authorization")
@@ -228,12 +359,7 @@ def lambda_handler(event: dict, context) -> dict:
         if not claims:
             logger.warning(
                 "JWT verification failed — unauthorized",
-                extra=log_ctx(
-                    request_id=request_id,
-                    method=method,
-                    path=path,
-                    module_name="lambda_function",
-                ),
+                extra=base_ctx,
             )
             return api_response(401, {"error": "Unauthorized"})
 
@@ -241,188 +367,31 @@ def lambda_handler(event: dict, context) -> dict:
         user_id, cognito_sub = _resolve_user_id(claims, request_id)
 
         # Artik tüm loglar için tam context mevcut
-        ctx = log_ctx(
-            request_id=request_id,
-            user_id=user_id,
-            cognito_sub=cognito_sub,
-            method=method,
-            path=path,
-            module_name="lambda_function",
-        )
+        ctx = {**base_ctx, "user_id": user_id, "cognito_sub": cognito_sub}
 
         logger.info("Request authenticated — routing", extra=ctx)
 
         # ── Protected Routes ───────────────────────────────────────
-
-        if path == "/auth/me" and method == "GET":
-            return handle_auth_me(user_id)
-
-        if path == "/dashboard" and method == "GET":
-            return handle_dashboard(user_id)
-
-        if path == "/analyze" and method == "POST":
-            return handle_ai_analyze(user_id, body)
-
-        # Receipts
-        if path == "/receipts" and method == "GET":
-            return handle_receipts_list(user_id, qsp)
-        if path == "/receipts/manual" and method == "POST":
-            return handle_manual_receipt_create(user_id, body)
-        if path == "/receipts/upload" and method == "POST":
-            return handle_upload_init(user_id, body)
-        if path == "/receipts/smart-extract" and method == "POST":
-            return handle_smart_extract(user_id, body)
-
-        if path.startswith("/receipts/"):
-            parts = path.split("/")
-            if len(parts) >= 3:
-                receipt_id = parts[2]
-                if len(parts) > 3 and parts[3] == "process" and method == "POST":
-                    return handle_receipt_process(user_id, receipt_id)
-                if len(parts) > 3 and parts[3] == "items":
-                    item_id = parts[4] if len(parts) > 4 and parts[4] else None
-                    return handle_receipt_items(user_id, receipt_id, method, body, item_id)
-                if method == "GET":
-                    return handle_receipt_detail(user_id, receipt_id)
-                if method == "PUT":
-                    return handle_receipt_update(user_id, receipt_id, body)
-                if method == "DELETE":
-                    return handle_receipt_delete(user_id, receipt_id)
-
-        # Fixed Expenses
-        if path == "/fixed-expenses" and method == "GET":
-            return handle_fixed_expenses_get(user_id, qsp)
-        if path == "/fixed-expenses/groups" and method == "POST":
-            return handle_fixed_expense_group_create(user_id, body)
-        if path.startswith("/fixed-expenses/groups/"):
-            parts = path.split("/")
-            group_id = parts[3] if len(parts) > 3 and parts[3] else None
-            if group_id:
-                if method == "PUT":
-                    return handle_fixed_expense_group_update(user_id, group_id, body)
-                if method == "DELETE":
-                    return handle_fixed_expense_group_delete(user_id, group_id)
-        if path == "/fixed-expenses/items" and method == "POST":
-            return handle_fixed_expense_item_create(user_id, body)
-        if path.startswith("/fixed-expenses/items/"):
-            parts = path.split("/")
-            item_id = parts[3] if len(parts) > 3 and parts[3] else None
-            if item_id:
-                if len(parts) > 4 and parts[4] in {"payment", "payments"} and method == "POST":
-                    return handle_fixed_expense_payment_upsert(user_id, item_id, body)
-                if method == "PUT":
-                    return handle_fixed_expense_item_update(user_id, item_id, body)
-                if method == "DELETE":
-                    return handle_fixed_expense_item_delete(user_id, item_id)
-
-        # Budgets
-        if path == "/budgets":
-            if method == "GET":
-                return handle_get_budgets(user_id)
-            if method == "POST":
-                return handle_set_budget(user_id, body)
-        if path.startswith("/budgets/"):
-            budget_id = path.split("/")[2] if len(path.split("/")) > 2 else None
-            if budget_id and method == "DELETE":
-                return handle_delete_budget(user_id, budget_id)
-
-        # Subscriptions
-        if path.startswith("/subscriptions"):
-            parts = path.split("/")
-            sub_id = parts[2] if len(parts) > 2 and parts[2] else None
-            return handle_subscriptions(user_id, method, body, sub_id)
-
-        # Goals
-        if path == "/goals":
-            if method in {"GET", "POST"}:
-                return handle_goals(user_id, method, body)
-        if path.startswith("/goals/"):
-            parts = path.split("/")
-            goal_id = parts[2] if len(parts) > 2 and parts[2] else None
-            if goal_id and method in {"PUT", "DELETE"}:
-                return handle_goals(user_id, method, body, goal_id)
-
-        # Insights
-        if path == "/insights/overview" and method == "GET":
-            return handle_insights_overview(user_id, qsp)
-        if path == "/insights/what-if" and method == "GET":
-            return handle_insights_what_if(user_id, qsp)
-
-        # AI Actions
-        if path == "/ai-actions":
-            if method in {"GET", "POST"}:
-                return handle_ai_actions(user_id, method, body, None, qsp)
-        if path.startswith("/ai-actions/"):
-            parts = path.split("/")
-            action_id = parts[2] if len(parts) > 2 and parts[2] else None
-            if action_id and len(parts) > 3 and parts[3] == "apply" and method == "POST":
-                return handle_ai_action_apply(user_id, action_id, body)
-            if action_id and method in {"PUT", "PATCH", "DELETE"}:
-                return handle_ai_actions(user_id, method, body, action_id, qsp)
-
-        # Export
-        if path == "/export" and method == "GET":
-            return handle_export_data(user_id)
-
-        # Reports
-        if path == "/reports/summary" and method == "GET":
-            return handle_reports_summary(user_id, qsp)
-        if path == "/reports/chart" and method == "GET":
-            return handle_chart_data(user_id, qsp)
-        if path == "/reports/detailed" and method == "GET":
-            return handle_reports_detailed(user_id, qsp)
-        if path == "/reports/ai-summary" and method == "GET":
-            return handle_reports_ai_summary(user_id, qsp)
-        if path == "/reports/ai-feedback" and method == "POST":
-            return handle_reports_ai_feedback(user_id, body)
-
-        # Incomes
-        if path == "/incomes" or path.startswith("/incomes/"):
-            parts = path.split("/")
-            income_id = parts[2] if len(parts) > 2 and parts[2] else None
-            return handle_incomes(user_id, method, body, income_id)
-
-        # Chat
-        if path == "/chat" and method == "POST":
-            return handle_ai_chat(user_id, body)
+        response = _dispatch(method, path, user_id, body, qsp)
+        if response is not None:
+            return response
 
         # 404
-        logger.warning(
-            "Endpoint not found",
-            extra=log_ctx(
-                request_id=request_id,
-                user_id=user_id,
-                cognito_sub=cognito_sub,
-                method=method,
-                path=path,
-                module_name="lambda_function",
-            ),
-        )
+        logger.warning("Endpoint not found", extra=ctx)
         return api_response(404, {"error": "Endpoint not found"})
 
     except Exception as exc:
         elapsed_ms = int((time.time() - start_time) * 1000)
         logger.error(
             "Unhandled exception in lambda_handler",
-            extra=log_ctx(
-                request_id=request_id,
-                method=method,
-                path=path,
-                module_name="lambda_function",
-                elapsed_ms=elapsed_ms,
-            ),
+            extra={**base_ctx, "elapsed_ms": elapsed_ms},
             exc_info=True,
         )
         return api_response(500, {"error": "Internal server error"})
     finally:
+        flush_metrics()
         elapsed_ms = int((time.time() - start_time) * 1000)
         logger.info(
             "Request completed",
-            extra=log_ctx(
-                request_id=request_id,
-                method=method,
-                path=path,
-                module_name="lambda_function",
-                elapsed_ms=elapsed_ms,
-            ),
+            extra={**base_ctx, "elapsed_ms": elapsed_ms},
         )
@@ -170,8 +170,13 @@ def ensure_tables_exist():
             # Indexes
             cur.execute("CREATE INDEX IF NOT EXISTS idx_incomes_user_date ON incomes(user_id, income_date);")
             cur.execute("CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user ON refresh_tokens(user_id, expires_at);")
+            # Login upserts one refresh token per user; drop legacy duplicates before enforcing it
+            cur.execute("DELETE FROM refresh_tokens t USING refresh_tokens n WHERE t.user_id = n.user_id AND t.id < n.id;")
+            cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_refresh_tokens_user ON refresh_tokens(user_id);")
             cur.execute("CREATE INDEX IF NOT EXISTS idx_receipts_user_date ON receipts(user_id, receipt_date);")
             cur.execute("CREATE INDEX IF NOT EXISTS idx_receipts_status ON receipts(status);")
+            # Rapor/özet sorguları (user_id, status, receipt_date) ile süzer; INCLUDE ile yalnız indeksten okunur
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_receipts_user_status_date ON receipts(user_id, status, receipt_date) INCLUDE (total_amount, category_id);")
             cur.execute("CREATE INDEX IF NOT EXISTS idx_budgets_user ON budgets(user_id);")
             cur.execute("CREATE INDEX IF NOT EXISTS idx_subscriptions_user ON subscriptions(user_id, next_payment_date);")
             cur.execute("CREATE INDEX IF NOT EXISTS idx_insights_user_period ON ai_insights(user_id, related_period);")
@@ -190,7 +195,10 @@ def ensure_tables_exist():
                 END $$;
             """)
             conn.commit()
+        return True
     except Exception as e:
         logger.error(f"Table creation failed: {e}")
+        conn.rollback()
+        return False
     finally:
         release_db_connection(conn)
@@ -1,61 +1,48 @@
-from datetime import datetime
-
 from psycopg2.extras import RealDictCursor
 
 from config import CATEGORIES, logger
 from db import get_db_connection, release_db_connection
-from helpers import _safe_float, api_response
+from helpers import _period_bounds, _safe_float, api_response
 
 
 def handle_get_budgets(user_id):
-    period = datetime.now().strftime("%Y-%m")
+    _, period_start, period_end = _period_bounds(None)
+    cat_ids = list(CATEGORIES)
     conn = get_db_connection()
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("SELECT id, user_id, category_name, amount, updated_at FROM budgets WHERE user_id=%s", (user_id,))
-            budgets = cur.fetchall()
+            # Bütçeler ve fiş + sabit gider harcamaları tek turda; kategori id -> ad eşlemesi
+            # CATEGORIES'ten dizi olarak verilir, eşlemenin kaynağı yine config'tir.
+            # Tarih filtresi aralık olarak yazılır; TO_CHAR(...) indeksleri kullanamıyordu.
             cur.execute(
-                """SELECT category_id, SUM(total_amount) AS spent
-                FROM receipts
-                WHERE user_id=%s AND status != 'deleted' AND TO_CHAR(receipt_date, 'YYYY-MM')=%s
-                GROUP BY category_id""",
-                (user_id, period)
+                """WITH cat(id, name) AS (
+                    SELECT * FROM unnest(%s::int[], %s::text[])
+                ), spent AS (
+                    SELECT COALESCE(cat.name, 'Diğer') AS category_name, SUM(r.total_amount) AS spent
+                    FROM receipts r LEFT JOIN cat ON cat.id = r.category_id
+                    WHERE r.user_id=%s AND r.status != 'deleted' AND r.receipt_date BETWEEN %s AND %s
+                    GROUP BY 1
+                    UNION ALL
+                    SELECT COALESCE(NULLIF(g.category_type, ''), 'Diğer'), SUM(p.amount)
+                    FROM fixed_expense_payments p
+                    JOIN fixed_expense_items i ON i.id = p.item_id
+                    JOIN fixed_expense_groups g ON g.id = i.group_id
+                    WHERE p.user_id=%s AND p.status = 'paid' AND p.payment_date BETWEEN %s AND %s
+                    GROUP BY 1
+                )
+                SELECT b.id, b.user_id, b.category_name, b.amount, b.updated_at,
+                    (SELECT SUM(s.spent) FROM spent s WHERE s.category_name = b.category_name) AS spent
+                FROM budgets b WHERE b.user_id=%s""",
+                (cat_ids, [CATEGORIES[c] for c in cat_ids],
+                 user_id, period_start, period_end, user_id, period_start, period_end, user_id),
             )
-            receipt_spent_rows = cur.fetchall()
-            cur.execute(
-                """SELECT g.category_type, SUM(p.amount) AS spent
-                FROM fixed_expense_payments p
-                JOIN fixed_expense_items i ON i.id = p.item_id
-                JOIN fixed_expense_groups g ON g.id = i.group_id
-                WHERE p.user_id=%s AND p.status = 'paid' AND TO_CHAR(p.payment_date, 'YYYY-MM')=%s
-                GROUP BY g.category_type""",
-                (user_id, period)
-            )
-            fixed_spent_rows = cur.fetchall()
-            receipt_spent_by_name = {}
-            for r in receipt_spent_rows:
-                cat_id = r.get("category_id")
-                if cat_id is not None:
-                    try:
-                        cat_id = int(cat_id)
-                    except ValueError:
-                        pass
-                c_name = CATEGORIES.get(cat_id, "Diğer")
-                receipt_spent_by_name[c_name] = receipt_spent_by_name.get(c_name, 0.0) + _safe_float(r.get("spent"), 0.0)
-            fixed_spent_by_name = {}
-            for r in fixed_spent_rows:
-                c_name = r.get("category_type") or "Diğer"
-                fixed_spent_by_name[c_name] = fixed_spent_by_name.get(c_name, 0.0) + _safe_float(r.get("spent"), 0.0)
-            normalized = []
+            budgets = cur.fetchall()
             for b in budgets:
-                c_name = b["category_name"]
                 limit_value = _safe_float(b.get("amount"), 0.0)
-                spent = receipt_spent_by_name.get(c_name, 0.0) + fixed_spent_by_name.get(c_name, 0.0)
-                pct = round((spent / limit_value) * 100, 1) if limit_value > 0 else 0.0
+                spent = _safe_float(b.get("spent"), 0.0)
                 b["spent"] = spent
-                b["percentage"] = pct
-                normalized.append(b)
-            return api_response(200, {"data": normalized})
+                b["percentage"] = round((spent / limit_value) * 100, 1) if limit_value > 0 else 0.0
+            return api_response(200, {"data": budgets})
     finally:
         release_db_connection(conn)
 
@@ -1,10 +1,8 @@
-import json
-
 from psycopg2.extras import RealDictCursor
 
 from config import CATEGORIES, bedrock_runtime, logger, get_langfuse
 from db import get_db_connection, release_db_connection
-from helpers import api_response, emit_bedrock_metrics, get_text_embedding
+from helpers import _json_dumps, _json_loads, api_response, emit_bedrock_metrics, get_text_embedding
 
 
 def handle_ai_chat(user_id, body):
@@ -65,7 +63,7 @@ def handle_ai_chat(user_id, body):
                        embedding <=> %s::vector AS distance
                 FROM receipts WHERE user_id = %s AND status != 'deleted' AND embedding IS NOT NULL
                 ORDER BY distance ASC LIMIT 40""",
-                (json.dumps(query_embedding), user_id)
+                (_json_dumps(query_embedding), user_id)
             )
             rows = cur.fetchall()
             if rows:
@@ -111,9 +109,9 @@ def handle_ai_chat(user_id, body):
             generation = trace.generation(name="claude-3-haiku", model="anthropic.claude-3-haiku-20240307-v1:0", input=payload["messages"])
         response = bedrock_runtime.invoke_model(
             modelId="anthropic.claude-3-haiku-20240307-v1:0",
-            body=json.dumps(payload), accept="application/json", contentType="application/json"
+            body=_json_dumps(payload), accept="application/json", contentType="application/json"
         )
-        response_body = json.loads(response["body"].read())
+        response_body = _json_loads(response["body"].read())
         reply_text = ""
         content_block = response_body.get("content", [])
         if content_block and isinstance(content_block, list):
@@ -102,16 +102,23 @@ def handle_fixed_expenses_get(user_id, params):
             groups = list(group_map.values())
             total, paid, count, pending_count = 0.0, 0.0, 0, 0
             for group in groups:
-                group_total = 0.0
+                group_total, group_paid, group_paid_count = 0.0, 0.0, 0
                 for item in group["items"]:
-                    count += 1
-                    group_total += _safe_float(item["amount"], 0.0)
-                    total += _safe_float(item["amount"], 0.0)
+                    amount = _safe_float(item["amount"], 0.0)
+                    group_total += amount
                     if item["status"] == "paid":
-                        paid += _safe_float(item["amount"], 0.0)
-                    else:
-                        pending_count += 1
+                        group_paid += amount
+                        group_paid_count += 1
+                items_count = len(group["items"])
+                # Grup özetleri sunucuda hesaplanır; istemci her render'da kalemleri taramaz
+                group["items_count"] = items_count
+                group["paid_count"] = group_paid_count
                 group["total_amount"] = round(group_total, 2)
+                group["remaining_amount"] = round(max(group_total - group_paid, 0), 2)
+                count += items_count
+                pending_count += items_count - group_paid_count
+                total += group_total
+                paid += group_paid
             return api_response(200, {
                 "month": period,
                 "stats": {"total": round(total, 2), "paid": round(paid, 2), "remaining": round(max(total - paid, 0), 2), "count": count, "pending_count": pending_count},
@@ -6,22 +6,74 @@ from datetime import date, datetime
 
 from psycopg2.extras import RealDictCursor
 
+try:
+    import pybase64
+except ImportError:  # opsiyonel SIMD kodlayıcı; yoksa stdlib base64 kullanılır
+    pybase64 = None
+
 from config import (
     BEDROCK_MODEL_ID, CATEGORIES, OCR_MAX_FILE_BYTES, S3_BUCKET_NAME,
     SUPPORTED_UPLOAD_TYPES, bedrock_runtime, logger, s3_client,
 )
-from db import get_db_connection, release_db_connection
+from db import bulk_insert, ensure_prepared, get_db_connection, release_db_connection
 from helpers import (
-    _build_receipt_image_url, _determine_category, _fix_date,
+    _build_receipt_image_url, _determine_category, _fix_date, _json_dumps, _json_loads,
     _resolve_category_id, _safe_float, api_response, emit_bedrock_metrics,
     get_text_embedding, _json_default,
 )
 
+# Tek istekte eklenebilecek en fazla fiş kalemi (tek execute_values sayfası)
+RECEIPT_ITEMS_BATCH_MAX = 200
+
+# Model yanıtını saran ```json ... ``` çitleri
+_CODE_FENCE_RE = re.compile(r"\A```(?:json)?|```\Z")
+
+
+def _b64encode_stream(body, chunk_size=3 * 65536):
+    # S3 gövdesi parça parça okunup kodlanır; yalnızca read() ile alınan tam gövde kopyası önlenir.
+    # Model isteği base64'ün tamamını tek string olarak istediğinden parçalar ve birleştirilmiş
+    # sonuç join sırasında yine birlikte bellektedir; tepe bellek bunun kabaca iki katıdır.
+    # Parçalar 3'ün katına hizalanır ki ara parçalarda dolgu ("=") oluşmasın.
+    encode = pybase64.b64encode_as_string if pybase64 is not None else (lambda b: base64.b64encode(b).decode("ascii"))
+    parts, carry = [], b""
+    for chunk in body.iter_chunks(chunk_size):
+        if carry:
+            chunk = carry + chunk
+        cut = len(chunk) - len(chunk) % 3
+        parts.append(encode(memoryview(chunk)[:cut]))
+        carry = chunk[cut:]
+    if carry:
+        parts.append(encode(carry))
+    return "".join(parts)
+
+
+def _encode_list_cursor(row):
+    raw = json.dumps([row["_sort_at"].isoformat(), row["created_at"].isoformat(), str(row["id"])])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_list_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_at, created_at, receipt_id = json.loads(raw)
+        # Bozuk imleç SQL'e ulaşmadan 400 olsun
+        datetime.fromisoformat(sort_at)
+        datetime.fromisoformat(created_at)
+        return sort_at, created_at, str(uuid.UUID(receipt_id))
+    except Exception:
+        return None
+
 
 def handle_receipts_list(user_id, params):
     params = params or {}
     limit = min(max(int(params.get("limit", 50)), 1), 200)
     offset = max(int(params.get("offset", 0)), 0)
+    cursor = params.get("cursor")
+    keyset = None
+    if cursor:
+        keyset = _decode_list_cursor(cursor)
+        if keyset is None:
+            return api_response(400, {"error": "Invalid cursor"})
     filters = ["user_id = %s"]
     values = [user_id]
     status = params.get("status")
@@ -44,22 +96,49 @@ def handle_receipts_list(user_id, params):
         filters.append("receipt_date <= %s")
         values.append(end_date)
     where_sql = " AND ".join(filters)
+    columns = """id, file_url, status, merchant_name, receipt_date, total_amount, category_id, created_at, updated_at,
+                    COALESCE(receipt_date, created_at) AS _sort_at"""
+    order_sql = "ORDER BY COALESCE(receipt_date, created_at) DESC, created_at DESC, id DESC"
     conn = get_db_connection()
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                f"""SELECT id, file_url, status, merchant_name, receipt_date, total_amount, category_id, created_at, updated_at
-                FROM receipts WHERE {where_sql}
-                ORDER BY COALESCE(receipt_date, created_at) DESC, created_at DESC
-                LIMIT %s OFFSET %s""",
-                values + [limit, offset],
-            )
-            rows = cur.fetchall()
+            if keyset:
+                # İmleçli sayfalama: OFFSET kadar satır atlanmaz, son satırın anahtarından devam edilir.
+                # Toplam her sayfada yeniden sayılmaz; istemci next_cursor boşalana kadar ilerler.
+                cur.execute(
+                    f"""SELECT {columns}
+                    FROM receipts WHERE {where_sql}
+                      AND (COALESCE(receipt_date, created_at), created_at, id) < (%s::timestamptz, %s::timestamptz, %s::uuid)
+                    {order_sql}
+                    LIMIT %s""",
+                    values + [*keyset, limit],
+                )
+                rows = cur.fetchall()
+            else:
+                # Toplam sayı aynı taramada pencere fonksiyonuyla gelir; ayrı COUNT(*) turu yok
+                cur.execute(
+                    f"""SELECT {columns}, COUNT(*) OVER () AS _total
+                    FROM receipts WHERE {where_sql}
+                    {order_sql}
+                    LIMIT %s OFFSET %s""",
+                    values + [limit, offset],
+                )
+                rows = cur.fetchall()
+                total = rows[0]["_total"] if rows else 0
+                if not rows and offset > 0:
+                    # Sayfa sonunun ötesi: pencere satırı yok, toplamı ayrıca say
+                    cur.execute(f"SELECT COUNT(*) AS total FROM receipts WHERE {where_sql}", values)
+                    total = cur.fetchone()["total"]
+            next_cursor = _encode_list_cursor(rows[-1]) if len(rows) == limit else None
             for row in rows:
+                row.pop("_total", None)
+                row.pop("_sort_at", None)
                 row["category"] = CATEGORIES.get(row.get("category_id"), "Diğer")
-            cur.execute(f"SELECT COUNT(*) AS total FROM receipts WHERE {where_sql}", values)
-            total = cur.fetchone()["total"]
-        return api_response(200, {"data": rows, "pagination": {"limit": limit, "offset": offset, "total": total}})
+        if keyset:
+            pagination = {"limit": limit, "next_cursor": next_cursor}
+        else:
+            pagination = {"limit": limit, "offset": offset, "total": total, "next_cursor": next_cursor}
+        return api_response(200, {"data": rows, "pagination": pagination})
     finally:
         release_db_connection(conn)
 
@@ -67,20 +146,13 @@ def handle_receipts_list(user_id, params):
 def handle_receipt_detail(user_id, receipt_id):
     conn = get_db_connection()
     try:
+        ensure_prepared(conn, "receipt")
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """SELECT id, user_id, file_url, status, merchant_name, receipt_date, total_amount,
-                       category_id, payment_method, description, created_at, updated_at
-                FROM receipts WHERE id=%s AND user_id=%s""",
-                (receipt_id, user_id),
-            )
+            cur.execute("EXECUTE receipt_by_id(%s, %s)", (receipt_id, user_id))
             receipt = cur.fetchone()
             if not receipt:
                 return api_response(404, {"error": "Receipt not found"})
-            cur.execute(
-                "SELECT id, item_name, quantity, unit_price, total_price FROM receipt_items WHERE receipt_id=%s ORDER BY id ASC",
-                (receipt_id,),
-            )
+            cur.execute("EXECUTE receipt_items_by_receipt(%s)", (receipt_id,))
             receipt["items"] = cur.fetchall()
             receipt["category"] = CATEGORIES.get(receipt.get("category_id"), "Diğer")
             receipt["image_url"] = _build_receipt_image_url(receipt.get("file_url"))
@@ -146,7 +218,7 @@ def handle_receipt_update(user_id, receipt_id, body):
                     vec = get_text_embedding(embed_text)
                     if vec:
                         updates.append("embedding=%s")
-                        values.append(json.dumps(vec))
+                        values.append(_json_dumps(vec))
         except Exception as e:
             logger.error(f"Error preparing embedding update: {e}")
         finally:
@@ -171,60 +243,98 @@ def handle_receipt_update(user_id, receipt_id, body):
         release_db_connection(conn)
 
 
+def _receipt_item_values(entry):
+    item_name = str(entry.get("item_name") or "").strip()
+    quantity = max(int(_safe_float(entry.get("quantity"), 1)), 1)
+    unit_price = _safe_float(entry.get("unit_price"), 0.0)
+    total_price = _safe_float(entry.get("total_price"), None) or round(unit_price * quantity, 2)
+    return item_name[:255], quantity, unit_price, total_price
+
+
+def _add_receipt_items(user_id, receipt_id, entries):
+    # Toplu ekleme: POST {"items": [{item_name, quantity, unit_price, total_price}, ...]}
+    if not entries or len(entries) > RECEIPT_ITEMS_BATCH_MAX:
+        return api_response(400, {"error": f"items must contain 1-{RECEIPT_ITEMS_BATCH_MAX} entries"})
+    rows = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            return api_response(400, {"error": "Each item must be an object"})
+        values = _receipt_item_values(entry)
+        if not values[0]:
+            return api_response(400, {"error": "item_name is required"})
+        rows.append((receipt_id, user_id, *values))
+    conn = get_db_connection()
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            # Sahiplik kontrolü tek satırlık yoldaki gibi INSERT'in içinde: tek tur
+            created = bulk_insert(
+                cur,
+                """INSERT INTO receipt_items (receipt_id, item_name, quantity, unit_price, total_price)
+                SELECT v.receipt_id, v.item_name, v.quantity, v.unit_price, v.total_price
+                FROM (VALUES %s) AS v (receipt_id, user_id, item_name, quantity, unit_price, total_price)
+                WHERE EXISTS (SELECT 1 FROM receipts r WHERE r.id = v.receipt_id AND r.user_id = v.user_id)
+                RETURNING id, receipt_id, item_name, quantity, unit_price, total_price""",
+                rows, page_size=RECEIPT_ITEMS_BATCH_MAX, fetch=True,
+                template="(%s::uuid, %s::uuid, %s, %s::int, %s::numeric, %s::numeric)",
+            )
+            if not created:
+                return api_response(404, {"error": "Receipt not found"})
+            conn.commit()
+            return api_response(201, {"items": created})
+    finally:
+        release_db_connection(conn)
+
+
 def handle_receipt_items(user_id, receipt_id, method, body, item_id=None):
     body = body or {}
+    if method == "POST" and isinstance(body.get("items"), list):
+        return _add_receipt_items(user_id, receipt_id, body["items"])
+    # Fiş sahipliği kontrolü her DML'in içinde (EXISTS) yapılır: istek başına tek tur
+    if method == "POST":
+        item_name, quantity, unit_price, total_price = _receipt_item_values(body)
+        if not item_name:
+            return api_response(400, {"error": "item_name is required"})
+        sql = """INSERT INTO receipt_items (receipt_id, item_name, quantity, unit_price, total_price)
+            SELECT r.id, %s, %s, %s, %s FROM receipts r WHERE r.id=%s AND r.user_id=%s
+            RETURNING id, receipt_id, item_name, quantity, unit_price, total_price"""
+        params = (item_name, quantity, unit_price, total_price, receipt_id, user_id)
+        ok_status, missing = 201, "Receipt not found"
+    elif method in {"PUT", "PATCH"} and item_id:
+        sets, vals = [], []
+        if body.get("item_name") is not None:
+            sets.append("item_name=%s"); vals.append(str(body["item_name"])[:255])
+        if body.get("quantity") is not None:
+            sets.append("quantity=%s"); vals.append(max(int(_safe_float(body["quantity"], 1)), 1))
+        if body.get("unit_price") is not None:
+            sets.append("unit_price=%s"); vals.append(_safe_float(body["unit_price"], 0.0))
+        if body.get("total_price") is not None:
+            sets.append("total_price=%s"); vals.append(_safe_float(body["total_price"], 0.0))
+        if not sets:
+            return api_response(400, {"error": "No valid fields"})
+        sql = f"""UPDATE receipt_items SET {', '.join(sets)}
+            WHERE id=%s AND receipt_id=%s
+              AND EXISTS (SELECT 1 FROM receipts r WHERE r.id=receipt_items.receipt_id AND r.user_id=%s)
+            RETURNING id, receipt_id, item_name, quantity, unit_price, total_price"""
+        params = (*vals, item_id, receipt_id, user_id)
+        ok_status, missing = 200, "Item not found"
+    elif method == "DELETE" and item_id:
+        sql = """DELETE FROM receipt_items
+            WHERE id=%s AND receipt_id=%s
+              AND EXISTS (SELECT 1 FROM receipts r WHERE r.id=receipt_items.receipt_id AND r.user_id=%s)
+            RETURNING id"""
+        params = (item_id, receipt_id, user_id)
+        ok_status, missing = 200, "Item not found"
+    else:
+        return api_response(405, {"error": "Method not allowed"})
     conn = get_db_connection()
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("SELECT id FROM receipts WHERE id=%s AND user_id=%s", (receipt_id, user_id))
-            if not cur.fetchone():
-                return api_response(404, {"error": "Receipt not found"})
-            if method == "POST":
-                item_name = str(body.get("item_name") or "").strip()
-                quantity = max(int(_safe_float(body.get("quantity"), 1)), 1)
-                unit_price = _safe_float(body.get("unit_price"), 0.0)
-                total_price = _safe_float(body.get("total_price"), None) or round(unit_price * quantity, 2)
-                if not item_name:
-                    return api_response(400, {"error": "item_name is required"})
-                cur.execute(
-                    """INSERT INTO receipt_items (receipt_id, item_name, quantity, unit_price, total_price)
-                    VALUES (%s,%s,%s,%s,%s)
-                    RETURNING id, receipt_id, item_name, quantity, unit_price, total_price""",
-                    (receipt_id, item_name[:255], quantity, unit_price, total_price),
-                )
-                conn.commit()
-                return api_response(201, cur.fetchone())
-            if method in {"PUT", "PATCH"} and item_id:
-                sets, vals = [], []
-                if body.get("item_name") is not None:
-                    sets.append("item_name=%s"); vals.append(str(body["item_name"])[:255])
-                if body.get("quantity") is not None:
-                    sets.append("quantity=%s"); vals.append(max(int(_safe_float(body["quantity"], 1)), 1))
-                if body.get("unit_price") is not None:
-                    sets.append("unit_price=%s"); vals.append(_safe_float(body["unit_price"], 0.0))
-                if body.get("total_price") is not None:
-                    sets.append("total_price=%s"); vals.append(_safe_float(body["total_price"], 0.0))
-                if not sets:
-                    return api_response(400, {"error": "No valid fields"})
-                vals.extend([item_id, receipt_id])
-                cur.execute(
-                    f"""UPDATE receipt_items SET {', '.join(sets)}
-                    WHERE id=%s AND receipt_id=%s
-                    RETURNING id, receipt_id, item_name, quantity, unit_price, total_price""",
-                    vals,
-                )
-                updated = cur.fetchone()
-                if not updated:
-                    return api_response(404, {"error": "Item not found"})
-                conn.commit()
-                return api_response(200, updated)
-            if method == "DELETE" and item_id:
-                cur.execute("DELETE FROM receipt_items WHERE id=%s AND receipt_id=%s RETURNING id", (item_id, receipt_id))
-                if not cur.fetchone():
-                    return api_response(404, {"error": "Item not found"})
-                conn.commit()
-                return api_response(200, {"deleted": True})
-            return api_response(405, {"error": "Method not allowed"})
+            cur.execute(sql, params)
+            row = cur.fetchone()
+            if not row:
+                return api_response(404, {"error": missing})
+            conn.commit()
+            return api_response(ok_status, {"deleted": True} if method == "DELETE" else row)
     finally:
         release_db_connection(conn)
 
@@ -243,23 +353,27 @@ def handle_receipt_process(user_id, receipt_id):
             conn.commit()
             try:
                 s3_obj = s3_client.get_object(Bucket=S3_BUCKET_NAME, Key=receipt["file_url"])
-                file_bytes = s3_obj["Body"].read()
+                # Boyut yanıt başlığından okunur: sınırı aşan dosya hiç indirilmez
+                file_size = s3_obj["ContentLength"]
+                if file_size > OCR_MAX_FILE_BYTES:
+                    s3_obj["Body"].close()
+                else:
+                    image_b64 = _b64encode_stream(s3_obj["Body"])
             except Exception as exc:
                 cur.execute("UPDATE receipts SET status='failed', updated_at=NOW() WHERE id=%s", (receipt_id,))
                 conn.commit()
                 logger.error(f"S3 file read failed for receipt {receipt_id}: {exc}")
                 return api_response(500, {"error": "File read failed"})
-            if len(file_bytes) > OCR_MAX_FILE_BYTES:
+            if file_size > OCR_MAX_FILE_BYTES:
                 cur.execute("UPDATE receipts SET status='failed', updated_at=NOW() WHERE id=%s", (receipt_id,))
                 conn.commit()
-                return api_response(413, {"error": "File too large for OCR", "max_bytes": OCR_MAX_FILE_BYTES, "current_bytes": len(file_bytes)})
+                return api_response(413, {"error": "File too large for OCR", "max_bytes": OCR_MAX_FILE_BYTES, "current_bytes": file_size})
             if receipt["file_url"].lower().endswith(".pdf"):
                 media_type = "application/pdf"
             elif receipt["file_url"].lower().endswith(".png"):
                 media_type = "image/png"
             else:
                 media_type = "image/jpeg"
-            image_b64 = base64.b64encode(file_bytes).decode("utf-8")
             system_prompt = "You are a financial AI assistant. Analyze the receipt image and extraction structured data. Output ONLY raw JSON. No markdown formatting, no code blocks, no conversational text."
             user_prompt = (
                 "Extract JSON only with fields: merchant_name,total_amount,receipt_date(YYYY-MM-DD),"
@@ -278,8 +392,8 @@ def handle_receipt_process(user_id, receipt_id):
             }
             raw_text = "{}"
             try:
-                resp = bedrock_runtime.invoke_model(modelId=BEDROCK_MODEL_ID, body=json.dumps(payload))
-                resp_body = json.loads(resp["body"].read())
+                resp = bedrock_runtime.invoke_model(modelId=BEDROCK_MODEL_ID, body=_json_dumps(payload))
+                resp_body = _json_loads(resp["body"].read())
                 _usage = resp_body.get("usage", {})
                 emit_bedrock_metrics("ocr", _usage.get("input_tokens", 0), _usage.get("output_tokens", 0))
                 content_block = resp_body.get("content", [])
@@ -294,17 +408,13 @@ def handle_receipt_process(user_id, receipt_id):
                 return api_response(500, {"error": "AI service error"})
             ocr_data = {}
             try:
-                clean_text = raw_text.strip()
-                if clean_text.startswith("```json"): clean_text = clean_text[7:]
-                if clean_text.startswith("```"): clean_text = clean_text[3:]
-                if clean_text.endswith("```"): clean_text = clean_text[:-3]
-                clean_text = clean_text.strip()
-                start_idx = clean_text.find('{')
-                end_idx = clean_text.rfind('}')
+                # Kod çiti süslü parantez içermez: {...} doğrudan ham metinden kesilir, kopya yok
+                start_idx = raw_text.find('{')
+                end_idx = raw_text.rfind('}')
                 if start_idx != -1 and end_idx != -1:
-                    ocr_data = json.loads(clean_text[start_idx:end_idx + 1])
+                    ocr_data = _json_loads(raw_text[start_idx:end_idx + 1])
                 else:
-                    ocr_data = json.loads(clean_text)
+                    ocr_data = _json_loads(_CODE_FENCE_RE.sub("", raw_text.strip()).strip())
             except Exception:
                 logger.error(f"OCR JSON parse failed. Raw text: {raw_text[:1000]}")
             if not ocr_data:
@@ -317,24 +427,34 @@ def handle_receipt_process(user_id, receipt_id):
             items = ocr_data.get("items") or []
             currency = str(ocr_data.get("currency") or "TRY")[:10]
             category_id = _determine_category(merchant, items=items, ai_suggested_id=ocr_data.get("category_id"))
-            cur.execute(
-                """UPDATE receipts SET merchant_name=%s, total_amount=%s, receipt_date=%s, category_id=%s,
-                    currency=%s, status='completed', updated_at=NOW() WHERE id=%s""",
-                (merchant, amount, r_date, category_id, currency, receipt_id),
-            )
-            cur.execute("DELETE FROM receipt_items WHERE receipt_id=%s", (receipt_id,))
             items_text = []
+            item_names, item_prices = [], []
             for item in items[:30]:
                 item_n = str(item.get("name") or "")[:255]
                 item_p = _safe_float(item.get("price"))
-                cur.execute("INSERT INTO receipt_items (receipt_id, item_name, total_price) VALUES (%s,%s,%s)", (receipt_id, item_n, item_p))
+                item_names.append(item_n)
+                item_prices.append(item_p)
                 if item_n and item_p:
                     items_text.append(f"{item_n} ({item_p} {currency})")
             cat_name = CATEGORIES.get(category_id, "Diğer")
             embed_text = f"Tarih: {r_date}. Mekan: {merchant}. Tutar: {amount} {currency}. Kategori: {cat_name}. Kalemler: {', '.join(items_text)}"
             vec = get_text_embedding(embed_text)
-            if vec:
-                cur.execute("UPDATE receipts SET embedding=%s WHERE id=%s", (json.dumps(vec), receipt_id))
+            # Fiş güncellemesi, eski kalemlerin silinmesi ve yenilerin eklenmesi tek ifade: tek tur.
+            # Embedding yazmadan önce alınır; Bedrock çağrısı sürerken satır kilidi tutulmaz.
+            cur.execute(
+                """WITH upd AS (
+                    UPDATE receipts SET merchant_name=%s, total_amount=%s, receipt_date=%s, category_id=%s,
+                        currency=%s, status='completed', embedding=COALESCE(%s::vector, embedding), updated_at=NOW()
+                    WHERE id=%s RETURNING id
+                ), del AS (
+                    DELETE FROM receipt_items WHERE receipt_id=%s
+                )
+                INSERT INTO receipt_items (receipt_id, item_name, total_price)
+                SELECT upd.id, i.item_name, i.total_price
+                FROM upd, unnest(%s::text[], %s::numeric[]) AS i(item_name, total_price)""",
+                (merchant, amount, r_date, category_id, currency, _json_dumps(vec) if vec else None,
+                 receipt_id, receipt_id, item_names, item_prices),
+            )
             conn.commit()
             return api_response(200, {
                 "receipt_id": receipt_id, "status": "completed", "merchant_name": merchant,
@@ -423,7 +543,7 @@ def handle_manual_receipt_create(user_id, body):
                     """INSERT INTO receipts (id, user_id, file_url, status, merchant_name, receipt_date, total_amount, category_id, currency, payment_method, description, embedding)
                     VALUES (%s,%s,%s,'completed',%s,%s,%s,%s,%s,%s,%s,%s)
                     RETURNING id, merchant_name, receipt_date, total_amount, category_id, status, payment_method, description, created_at, updated_at""",
-                    (rid, user_id, manual_key, merchant_name[:255], receipt_date, total_amount, category_id, currency, payment_method, description, json.dumps(vec)),
+                    (rid, user_id, manual_key, merchant_name[:255], receipt_date, total_amount, category_id, currency, payment_method, description, _json_dumps(vec)),
                 )
             else:
                 cur.execute(
@@ -468,7 +588,7 @@ def handle_smart_extract(user_id, body):
         if start != -1 and end != -1 and end > start:
             json_str = re.sub(r',\s*}', '}', output_text[start:end + 1])
             try:
-                return api_response(200, json.loads(json_str))
+                return api_response(200, _json_loads(json_str))
             except json.JSONDecodeError:
                 try:
                     import ast
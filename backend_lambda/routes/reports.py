@@ -21,37 +21,27 @@ def handle_reports_summary(user_id, params):
     conn = get_db_connection()
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            # Dört özet (ay, ay x kategori, genel toplam, kategori) aynı satırlar üzerinden tek taramada;
+            # gs = GROUPING(month, category_id): 0 ay+kategori, 1 ay, 2 kategori, 3 genel toplam
             cur.execute(
-                """SELECT TO_CHAR(DATE_TRUNC('month', receipt_date), 'YYYY-MM') AS month,
-                       COUNT(*) AS receipt_count, COALESCE(SUM(total_amount),0) AS total_expense,
-                       COALESCE(AVG(total_amount),0) AS avg_expense
-                FROM receipts WHERE user_id=%s AND status='completed' AND receipt_date >= %s
-                GROUP BY 1 ORDER BY 1 DESC""",
+                """SELECT GROUPING(month, category_id) AS gs, month, category_id,
+                       COUNT(*) AS receipt_count, COALESCE(SUM(total_amount),0) AS total,
+                       COALESCE(AVG(total_amount),0) AS avg_amount
+                FROM (
+                    SELECT TO_CHAR(DATE_TRUNC('month', receipt_date), 'YYYY-MM') AS month, category_id, total_amount
+                    FROM receipts WHERE user_id=%s AND status='completed' AND receipt_date >= %s
+                ) r
+                GROUP BY GROUPING SETS ((month), (month, category_id), (), (category_id))
+                ORDER BY gs, month DESC, total DESC""",
                 (user_id, period_start),
             )
-            monthly_rows = cur.fetchall()
-            cur.execute(
-                """SELECT TO_CHAR(DATE_TRUNC('month', receipt_date), 'YYYY-MM') AS month,
-                       category_id, COALESCE(SUM(total_amount),0) AS total
-                FROM receipts WHERE user_id=%s AND status='completed' AND receipt_date >= %s
-                GROUP BY 1,2 ORDER BY 1 DESC, total DESC""",
-                (user_id, period_start),
-            )
-            category_rows = cur.fetchall()
-            cur.execute(
-                """SELECT COALESCE(SUM(total_amount),0) AS total_expense, COUNT(*) AS total_receipts,
-                       COALESCE(AVG(total_amount),0) AS avg_receipt_amount
-                FROM receipts WHERE user_id=%s AND status='completed' AND receipt_date >= %s""",
-                (user_id, period_start),
-            )
-            totals = cur.fetchone()
-            cur.execute(
-                """SELECT category_id, COALESCE(SUM(total_amount),0) AS total
-                FROM receipts WHERE user_id=%s AND status='completed' AND receipt_date >= %s
-                GROUP BY category_id ORDER BY total DESC LIMIT 5""",
-                (user_id, period_start),
-            )
-            top_categories = cur.fetchall()
+            grouped = {0: [], 1: [], 2: [], 3: []}
+            for row in cur.fetchall():
+                grouped[row["gs"]].append(row)
+        category_rows = grouped[0]
+        monthly_rows = grouped[1]
+        top_categories = grouped[2][:5]
+        totals = grouped[3][0]
         category_by_month = {}
         for row in category_rows:
             mk = row["month"]
@@ -62,10 +52,10 @@ def handle_reports_summary(user_id, params):
         for row in monthly_rows:
             mk = row["month"]
             mc = category_by_month.get(mk, [])
-            data.append({"month": mk, "total_expense": round(_safe_float(row["total_expense"]), 2), "avg_expense": round(_safe_float(row["avg_expense"]), 2), "receipt_count": int(row["receipt_count"] or 0), "top_category": mc[0] if mc else None, "categories": mc})
+            data.append({"month": mk, "total_expense": round(_safe_float(row["total"]), 2), "avg_expense": round(_safe_float(row["avg_amount"]), 2), "receipt_count": int(row["receipt_count"] or 0), "top_category": mc[0] if mc else None, "categories": mc})
         return api_response(200, {
             "period_start": period_start.isoformat(), "period_end": today.isoformat(), "months": months, "currency": "TRY",
-            "summary": {"total_expense": round(_safe_float(totals["total_expense"]), 2), "total_receipts": int(totals["total_receipts"] or 0), "avg_receipt_amount": round(_safe_float(totals["avg_receipt_amount"]), 2),
+            "summary": {"total_expense": round(_safe_float(totals["total"]), 2), "total_receipts": int(totals["receipt_count"] or 0), "avg_receipt_amount": round(_safe_float(totals["avg_amount"]), 2),
                 "top_categories": [{"category_id": r["category_id"], "category_name": CATEGORIES.get(r["category_id"], "Diğer"), "total": round(_safe_float(r["total"]), 2)} for r in top_categories]},
             "data": data,
         })
@@ -6,8 +6,11 @@ so individual test files don't need to patch them repeatedly.
 """
 import sys
 import types
+from contextlib import contextmanager
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 # ---------------------------------------------------------------------------
 # Stub heavy third-party packages that are NOT installed in the test env
 # (psycopg2, jose) — these are Linux-compiled binaries bundled with the zip
@@ -69,6 +72,13 @@ fake_config.CATEGORY_KEYWORDS = {
 }
 fake_config.S3_BUCKET_NAME = "test-bucket"
 fake_config.TITAN_EMBEDDING_MODEL_ID = "amazon.titan-embed-text-v2:0"
+fake_config.BEDROCK_MODEL_ID = "anthropic.claude-3-haiku-20240307-v1:0"
+fake_config.OCR_MAX_FILE_BYTES = 3145728
+fake_config.SUPPORTED_UPLOAD_TYPES = {"image/jpeg": "jpg", "image/png": "png", "application/pdf": "pdf"}
+fake_config.AI_LAMBDA_FUNCTION_NAME = "lambda_ai"
+fake_config.AI_CACHE_TTL_SECONDS = 21600
+fake_config.lambda_client = MagicMock()
+fake_config.get_langfuse = MagicMock(return_value=None)
 fake_config.bedrock_runtime = MagicMock()
 fake_config.cw_client = MagicMock()
 fake_config.s3_client = MagicMock()
@@ -77,6 +87,8 @@ fake_config.log_ctx = lambda **kw: kw
 fake_config.COGNITO_USER_POOL_ID = "us-east-1_test"
 fake_config.COGNITO_CLIENT_ID = "test-client-id"
 fake_config.AWS_REGION = "us-east-1"
+fake_config.COGNITO_ISSUER = "https://cognito-idp.us-east-1.amazonaws.com/us-east-1_test"
+fake_config.COGNITO_JWKS_URL = fake_config.COGNITO_ISSUER + "/.well-known/jwks.json"
 fake_config.REFRESH_TOKEN_DAYS = 30
 fake_config.TOKEN_USE_ALLOWED = {"access"}
 fake_config.cognito = MagicMock()
@@ -87,4 +99,27 @@ sys.modules["config"] = fake_config
 fake_db = types.ModuleType("db")
 fake_db.get_db_connection = MagicMock()
 fake_db.release_db_connection = MagicMock()
+
+
+@contextmanager
+def _fake_pooled_conn(cursor_factory=None):
+    conn = fake_db.get_db_connection()
+    try:
+        with conn.cursor(cursor_factory=cursor_factory) as cur:
+            yield conn, cur
+    finally:
+        fake_db.release_db_connection(conn)
+
+
+fake_db.pooled_conn = _fake_pooled_conn
+fake_db.ensure_prepared = MagicMock()
+fake_db.bulk_insert = MagicMock()
+fake_db.maybe_run_migrations_once = MagicMock()
 sys.modules["db"] = fake_db
+
+
+@pytest.fixture(autouse=True)
+def _reset_fake_db():
+    """Stop per-test return_value/side_effect on the shared connection mock leaking across tests."""
+    yield
+    fake_db.get_db_connection.reset_mock(return_value=True, side_effect=True)
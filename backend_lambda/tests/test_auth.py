@@ -234,6 +234,47 @@ class TestHandleAuthRefresh:
         assert res["statusCode"] == 500
 
 
+# ---------------------------------------------------------------------------
+# _save_refresh_token
+# ---------------------------------------------------------------------------
+
+class _PgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+class TestSaveRefreshToken:
+
+    def setup_method(self):
+        import db
+        self.conn = MagicMock()
+        self.cur = self.conn.cursor.return_value.__enter__.return_value
+        db.get_db_connection.return_value = self.conn
+        db.get_db_connection.side_effect = None
+
+    def _statements(self):
+        return [c[0][0].split()[0] for c in self.cur.execute.call_args_list]
+
+    def test_upsert_when_unique_index_exists(self):
+        auth._save_refresh_token("u1", "tok")
+        assert self._statements() == ["INSERT"]
+        self.conn.commit.assert_called_once()
+
+    def test_missing_unique_index_falls_back_to_delete_insert(self):
+        self.cur.execute.side_effect = [_PgError("42P10"), None, None]
+        auth._save_refresh_token("u1", "tok")
+        assert self._statements() == ["INSERT", "DELETE", "INSERT"]
+        self.conn.rollback.assert_called_once()
+        self.conn.commit.assert_called_once()
+
+    def test_other_db_errors_are_not_retried(self):
+        self.cur.execute.side_effect = _PgError("23503")
+        auth._save_refresh_token("u1", "tok")
+        assert self._statements() == ["INSERT"]
+        self.conn.commit.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # verify_jwt (guard function)
 # ---------------------------------------------------------------------------
@@ -244,6 +285,12 @@ class TestVerifyJwt:
     We test the guard conditions without a real token.
     """
 
+    @pytest.fixture(autouse=True)
+    def _clear_verify_cache(self):
+        auth._VERIFY_CACHE.clear()
+        yield
+        auth._VERIFY_CACHE.clear()
+
     def test_none_token_returns_none(self):
         assert auth.verify_jwt(None) is None
 
@@ -259,3 +306,170 @@ class TestVerifyJwt:
 
     def test_whitespace_only_returns_none(self):
         assert auth.verify_jwt("   ") is None
+
+    @pytest.mark.parametrize("token", ["a.b", "a.b.c.d", "a." * 5000 + "b"])
+    def test_wrong_shape_rejected_before_decoding(self, token):
+        with patch.object(auth, "_verify_uncached") as verify:
+            assert auth.verify_jwt(token) is None
+        verify.assert_not_called()
+
+    @staticmethod
+    def _token(claims, header=None):
+        import base64
+        enc = lambda obj: base64.urlsafe_b64encode(json.dumps(obj).encode()).rstrip(b"=").decode()
+        return f"{enc(header or {'kid': 'k1', 'alg': 'RS256'})}.{enc(claims)}.c2ln"
+
+    @staticmethod
+    def _key(valid=True):
+        key = MagicMock()
+        key.verify.return_value = valid
+        return key
+
+    def _claims(self, **overrides):
+        claims = {
+            "sub": "u1", "client_id": "test-client-id", "token_use": "access",
+            "iss": auth.EXPECTED_ISSUER, "exp": auth.time.time() + 300,
+        }
+        claims.update(overrides)
+        return claims
+
+    def test_valid_access_token_returns_claims(self):
+        claims = self._claims()
+        key = self._key()
+        with patch.object(auth, "_get_public_key", return_value=key):
+            assert auth.verify_jwt(self._token(claims)) == claims
+        signing_input, signature = key.verify.call_args[0]
+        assert signing_input.count(b".") == 1
+        assert signature == b"sig"
+
+    def test_bad_signature_returns_none(self):
+        with patch.object(auth, "_get_public_key", return_value=self._key(valid=False)):
+            assert auth.verify_jwt(self._token(self._claims())) is None
+
+    def test_expired_token_returns_none(self):
+        with patch.object(auth, "_get_public_key", return_value=self._key()):
+            assert auth.verify_jwt(self._token(self._claims(exp=auth.time.time() - 1))) is None
+
+    def test_wrong_issuer_returns_none(self):
+        with patch.object(auth, "_get_public_key", return_value=self._key()):
+            assert auth.verify_jwt(self._token(self._claims(iss="https://evil.example.com"))) is None
+
+    def test_wrong_client_returns_none(self):
+        with patch.object(auth, "_get_public_key", return_value=self._key()):
+            assert auth.verify_jwt(self._token(self._claims(client_id="other-client"))) is None
+
+    def test_disallowed_token_use_returns_none(self):
+        claims = self._claims(token_use="id", aud="test-client-id")
+        claims.pop("client_id")
+        with patch.object(auth, "_get_public_key", return_value=self._key()):
+            assert auth.verify_jwt(self._token(claims)) is None
+
+    def test_non_rs256_header_returns_none(self):
+        token = self._token(self._claims(), header={"kid": "k1", "alg": "none"})
+        with patch.object(auth, "_get_public_key", return_value=self._key()):
+            assert auth.verify_jwt(token) is None
+
+    def test_unknown_kid_returns_none(self):
+        with patch.object(auth, "_get_public_key", return_value=None):
+            assert auth.verify_jwt(self._token(self._claims())) is None
+
+    def test_repeat_token_verifies_signature_once(self):
+        claims = self._claims()
+        token = self._token(claims)
+        key = self._key()
+        with patch.object(auth, "_get_public_key", return_value=key):
+            first = auth.verify_jwt(token)
+            first["sub"] = "mutated"
+            assert auth.verify_jwt(token) == claims
+        assert key.verify.call_count == 1
+
+    def test_failed_verification_is_not_cached(self):
+        token = self._token(self._claims())
+        with patch.object(auth, "_get_public_key", return_value=self._key(valid=False)):
+            assert auth.verify_jwt(token) is None
+        with patch.object(auth, "_get_public_key", return_value=self._key()):
+            assert auth.verify_jwt(token) is not None
+
+    def test_token_near_expiry_is_not_cached(self):
+        claims = self._claims(exp=auth.time.time() + auth.VERIFY_CACHE_EXP_SKEW - 5)
+        key = self._key()
+        with patch.object(auth, "_get_public_key", return_value=key):
+            assert auth.verify_jwt(self._token(claims)) == claims
+        assert not auth._VERIFY_CACHE
+
+    def test_jwks_refresh_clears_verify_cache(self):
+        auth._VERIFY_CACHE["tok"] = {"exp": auth.time.time() + 300}
+        response = MagicMock(status=200, data=json.dumps({"keys": []}).encode())
+        with patch.object(auth._HTTP, "request", return_value=response):
+            auth.refresh_jwks()
+        assert not auth._VERIFY_CACHE
+
+
+class TestJwksCache:
+
+    def setup_method(self):
+        auth.JWKS_BY_KID.clear()
+        auth._jwks_fetched_at = 0.0
+
+    def teardown_method(self):
+        auth.JWKS_BY_KID.clear()
+        auth._jwks_fetched_at = 0.0
+
+    def _http_get(self, keys):
+        resp = MagicMock(status=200, data=json.dumps({"keys": keys}).encode())
+        return MagicMock(return_value=resp)
+
+    def test_keys_are_constructed_once_and_reused(self):
+        keys = [{"kid": "k1", "alg": "RS256", "use": "sig"}, {"kid": "enc", "use": "enc"}]
+        with patch.object(auth._HTTP, "request", self._http_get(keys)) as http_get, \
+                patch.object(auth.jwk, "construct", side_effect=lambda k, alg: ("key", k["kid"])) as construct:
+            assert auth._get_public_key("k1") == ("key", "k1")
+            assert auth._get_public_key("k1") == ("key", "k1")
+        assert http_get.call_count == 1
+        assert construct.call_count == 1
+        assert "enc" not in auth.JWKS_BY_KID
+
+    def test_unknown_kid_refetches_after_min_interval(self):
+        auth.JWKS_BY_KID["old"] = "old-key"
+        auth._jwks_fetched_at = auth.time.time() - auth.JWKS_MIN_REFRESH_INTERVAL - 1
+        keys = [{"kid": "new", "alg": "RS256"}]
+        with patch.object(auth._HTTP, "request", self._http_get(keys)), \
+                patch.object(auth.jwk, "construct", return_value="new-key"):
+            assert auth._get_public_key("new") == "new-key"
+
+
+class TestB64UrlDecode:
+
+    @pytest.mark.parametrize("raw", [b"", b"a", b"ab", b"abc", b"\xfb\xff\xfe", b'{"sub":"u1"}'])
+    def test_roundtrip_without_padding(self, raw):
+        import base64
+        encoded = base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+        assert auth._b64url_decode(encoded) == raw
+
+
+class TestEnsureUserRecord:
+
+    def _cursor(self):
+        import db
+        conn = MagicMock()
+        db.get_db_connection.return_value = conn
+        return conn, conn.cursor.return_value.__enter__.return_value
+
+    def test_existing_unchanged_user_skips_upsert(self):
+        conn, cur = self._cursor()
+        row = {"id": 1, "cognito_sub": "s1", "email": "a@b.com", "full_name": "A", "created_at": None}
+        cur.fetchone.return_value = row
+        user = auth._ensure_user_record({"sub": "s1", "email": "a@b.com", "name": "A"})
+        assert user == row
+        assert cur.execute.call_count == 1
+        conn.commit.assert_not_called()
+
+    def test_changed_email_falls_through_to_upsert(self):
+        conn, cur = self._cursor()
+        existing = {"id": 1, "cognito_sub": "s1", "email": "old@b.com", "full_name": "A", "created_at": None}
+        updated = dict(existing, email="new@b.com")
+        cur.fetchone.side_effect = [existing, updated]
+        user = auth._ensure_user_record({"sub": "s1", "email": "new@b.com"})
+        assert user == updated
+        assert cur.execute.call_args[0][0].startswith("EXECUTE user_upsert")
+        conn.commit.assert_called_once()
@@ -25,6 +25,7 @@ import pytest
 # conftest.py stubs config/db before this import
 sys.path.insert(0, ".")
 from helpers import (
+    _build_keyword_index,
     _coerce_bool,
     _determine_category,
     _fix_date,
@@ -37,6 +38,8 @@ from helpers import (
     _resolve_category_id,
     _safe_float,
     api_response,
+    emit_bedrock_metrics,
+    flush_metrics,
 )
 
 
@@ -254,6 +257,11 @@ class TestDetermineCategory:
     def test_item_level_fuel(self):
         assert _determine_category("", items=[{"name": "benzin"}]) == 7
 
+    def test_keyword_index_keeps_category_order_for_shared_keywords(self):
+        index = _build_keyword_index({5: ["fatura", "netflix"], 9: ["netflix", "disney"]})
+        assert index == {"fatura": (5,), "netflix": (5, 9), "disney": (9,)}
+        assert list(index) == ["fatura", "netflix", "disney"]
+
 
 # ---------------------------------------------------------------------------
 # _resolve_category_id
@@ -359,3 +367,26 @@ class TestFixDate:
 
     def test_month_boundary(self):
         assert _fix_date("2025-12-31") == "2025-12-31"
+
+
+# ---------------------------------------------------------------------------
+# emit_bedrock_metrics / flush_metrics
+# ---------------------------------------------------------------------------
+
+class TestBedrockMetrics:
+    def test_metrics_buffered_until_flush(self):
+        import helpers
+        helpers.cw_client.reset_mock()
+        emit_bedrock_metrics("ocr", 100, 20)
+        emit_bedrock_metrics("embedding", 50, 0)
+        helpers.cw_client.put_metric_data.assert_not_called()
+        flush_metrics()
+        helpers.cw_client.put_metric_data.assert_called_once()
+        assert len(helpers.cw_client.put_metric_data.call_args.kwargs["MetricData"]) == 6
+
+    def test_flush_with_empty_buffer_is_noop(self):
+        import helpers
+        flush_metrics()
+        helpers.cw_client.reset_mock()
+        flush_metrics()
+        helpers.cw_client.put_metric_data.assert_not_called()
@@ -59,3 +59,169 @@ class TestRouteHandlers:
         assert res["statusCode"] == 500
         import json
         assert "error" in json.loads(res["body"])
+
+
+class TestReceiptItemsBatch:
+
+    @patch("routes.receipts.bulk_insert")
+    @patch("routes.receipts.get_db_connection")
+    @patch("routes.receipts.release_db_connection")
+    def test_batch_post_inserts_all_items_in_one_call(self, mock_release, mock_get_db, mock_bulk):
+        """POST {"items": [...]} inserts every row via one bulk_insert that also checks ownership."""
+        from routes.receipts import handle_receipt_items
+        mock_conn = MagicMock()
+        mock_get_db.return_value = mock_conn
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        mock_bulk.return_value = [{"id": 1}, {"id": 2}]
+
+        body = {"items": [
+            {"item_name": "Süt", "quantity": 2, "unit_price": 10},
+            {"item_name": "Ekmek", "total_price": 7.5},
+        ]}
+        res = handle_receipt_items("u1", "r1", "POST", body)
+        assert res["statusCode"] == 201
+        rows = mock_bulk.call_args[0][2]
+        assert rows == [("r1", "u1", "Süt", 2, 10.0, 20.0), ("r1", "u1", "Ekmek", 1, 0.0, 7.5)]
+        assert "WHERE EXISTS" in mock_bulk.call_args[0][1]
+        mock_cursor.execute.assert_not_called()
+        mock_conn.commit.assert_called_once()
+
+    @patch("routes.receipts.bulk_insert", return_value=[])
+    @patch("routes.receipts.get_db_connection")
+    @patch("routes.receipts.release_db_connection")
+    def test_batch_post_to_foreign_receipt_returns_404(self, mock_release, mock_get_db, mock_bulk):
+        """No rows inserted (receipt missing or owned by someone else) maps to 404."""
+        from routes.receipts import handle_receipt_items
+        mock_conn = MagicMock()
+        mock_get_db.return_value = mock_conn
+        res = handle_receipt_items("u1", "r1", "POST", {"items": [{"item_name": "Süt"}]})
+        assert res["statusCode"] == 404
+        mock_conn.commit.assert_not_called()
+
+    def test_batch_post_rejects_nameless_item(self):
+        from routes.receipts import handle_receipt_items
+        res = handle_receipt_items("u1", "r1", "POST", {"items": [{"item_name": " "}]})
+        assert res["statusCode"] == 400
+
+
+class TestReceiptsListCursor:
+
+    @patch("routes.receipts.get_db_connection")
+    @patch("routes.receipts.release_db_connection")
+    def test_full_page_returns_cursor_that_round_trips(self, mock_release, mock_get_db):
+        """A full page yields next_cursor; passing it back seeks past the last row instead of using OFFSET."""
+        from datetime import datetime, timezone
+        from routes.receipts import handle_receipts_list
+        mock_conn = MagicMock()
+        mock_get_db.return_value = mock_conn
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        ts = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+        rid = "0f8fad5b-d9cb-469f-a165-70867728950e"
+        mock_cursor.fetchall.side_effect = lambda: [
+            {"id": rid, "category_id": 1, "created_at": ts, "_sort_at": ts, "_total": 3},
+        ]
+
+        import json
+        first = json.loads(handle_receipts_list("u1", {"limit": "1"})["body"])
+        cursor = first["pagination"]["next_cursor"]
+        assert cursor and first["pagination"]["total"] == 3
+        assert "_sort_at" not in first["data"][0]
+
+        second = json.loads(handle_receipts_list("u1", {"limit": "1", "cursor": cursor})["body"])
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "OFFSET" not in sql
+        assert params[-4:] == [ts.isoformat(), ts.isoformat(), rid, 1]
+        assert set(second["pagination"]) == {"limit", "next_cursor"}
+
+    def test_invalid_cursor_returns_400(self):
+        from routes.receipts import handle_receipts_list
+        res = handle_receipts_list("u1", {"cursor": "not-a-cursor"})
+        assert res["statusCode"] == 400
+
+
+class TestDispatch:
+    """lambda_function._dispatch: static table, parametric patterns and the 404/405 fallthroughs."""
+
+    @staticmethod
+    def _dispatch(method, path, body=None, qsp=None):
+        import lambda_function
+        return lambda_function._dispatch(method, path, "u1", body or {}, qsp or {})
+
+    @pytest.mark.parametrize("method,path,handler", [
+        ("GET", "/dashboard", "handle_dashboard"),
+        ("GET", "/receipts", "handle_receipts_list"),
+        ("POST", "/receipts/manual", "handle_manual_receipt_create"),
+        ("POST", "/receipts/upload", "handle_upload_init"),
+        ("GET", "/fixed-expenses", "handle_fixed_expenses_get"),
+        ("POST", "/fixed-expenses/items", "handle_fixed_expense_item_create"),
+        ("GET", "/budgets", "handle_get_budgets"),
+        ("GET", "/insights/overview", "handle_insights_overview"),
+        ("GET", "/reports/summary", "handle_reports_summary"),
+        ("POST", "/chat", "handle_ai_chat"),
+    ])
+    def test_static_routes(self, method, path, handler):
+        with patch(f"lambda_function.{handler}", return_value="ok") as mock_handler:
+            assert self._dispatch(method, path) == "ok"
+        mock_handler.assert_called_once()
+
+    @patch("lambda_function.handle_receipt_detail", return_value="ok")
+    def test_receipt_detail(self, mock_handler):
+        assert self._dispatch("GET", "/receipts/r1") == "ok"
+        mock_handler.assert_called_once_with("u1", "r1")
+
+    @patch("lambda_function.handle_receipt_items", return_value="ok")
+    def test_receipt_items_collection_and_item(self, mock_handler):
+        body = {"item_name": "Süt"}
+        self._dispatch("POST", "/receipts/r1/items", body)
+        self._dispatch("PUT", "/receipts/r1/items/i1", body)
+        self._dispatch("DELETE", "/receipts/r1/items/")
+        assert [c.args for c in mock_handler.call_args_list] == [
+            ("u1", "r1", "POST", body, None),
+            ("u1", "r1", "PUT", body, "i1"),
+            ("u1", "r1", "DELETE", {}, None),
+        ]
+
+    @patch("lambda_function.handle_receipt_process", return_value="ok")
+    def test_receipt_process(self, mock_handler):
+        assert self._dispatch("POST", "/receipts/r1/process") == "ok"
+        mock_handler.assert_called_once_with("u1", "r1")
+        # GET on /process falls through to receipt detail, as with the old if/elif router
+        with patch("lambda_function.handle_receipt_detail", return_value="detail") as mock_detail:
+            assert self._dispatch("GET", "/receipts/r1/process") == "detail"
+        mock_detail.assert_called_once_with("u1", "r1")
+
+    @pytest.mark.parametrize("suffix", ["payment", "payments"])
+    @patch("lambda_function.handle_fixed_expense_payment_upsert", return_value="ok")
+    def test_fixed_expense_payment(self, mock_handler, suffix):
+        body = {"month": 5, "year": 2024}
+        assert self._dispatch("POST", f"/fixed-expenses/items/i1/{suffix}", body) == "ok"
+        mock_handler.assert_called_once_with("u1", "i1", body)
+
+    @patch("lambda_function.handle_ai_actions", return_value="crud")
+    @patch("lambda_function.handle_ai_action_apply", return_value="applied")
+    def test_ai_action_apply(self, mock_apply, mock_actions):
+        assert self._dispatch("POST", "/ai-actions/a1/apply") == "applied"
+        mock_apply.assert_called_once_with("u1", "a1", {})
+        # apply is POST-only; other methods fall through to the per-id CRUD handler
+        assert self._dispatch("PUT", "/ai-actions/a1/apply") == "crud"
+        mock_actions.assert_called_once_with("u1", "PUT", {}, "a1", {})
+
+    @patch("lambda_function.handle_subscriptions", return_value="ok")
+    def test_subscriptions_ignores_trailing_segments(self, mock_handler):
+        self._dispatch("GET", "/subscriptions")
+        self._dispatch("DELETE", "/subscriptions/s1/extra")
+        assert [c.args[3] for c in mock_handler.call_args_list] == [None, "s1"]
+
+    @pytest.mark.parametrize("method,path", [
+        ("GET", "/unknown-route"),
+        ("GET", "/fixed-expenses/groups/g1"),
+        ("POST", "/budgets/b1"),
+        ("GET", "/receipts//items"),
+        ("GET", "/subscriptionsX"),
+    ])
+    def test_unmatched_returns_none_for_404(self, method, path):
+        assert self._dispatch(method, path) is None
+
+    def test_receipt_items_unsupported_method_returns_405(self):
+        res = self._dispatch("PATCH", "/receipts/r1/items")
+        assert res["statusCode"] == 405
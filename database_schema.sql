@@ -20,6 +20,7 @@ CREATE TABLE IF NOT EXISTS refresh_tokens (
 );
 
 CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user ON refresh_tokens(user_id, expires_at);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_refresh_tokens_user ON refresh_tokens(user_id);
 
 -- ==========================================
 -- Receipts
@@ -51,6 +52,7 @@ CREATE TABLE IF NOT EXISTS receipt_items (
 
 CREATE INDEX IF NOT EXISTS idx_receipts_user_date ON receipts(user_id, receipt_date);
 CREATE INDEX IF NOT EXISTS idx_receipts_status ON receipts(status);
+CREATE INDEX IF NOT EXISTS idx_receipts_user_status_date ON receipts(user_id, status, receipt_date) INCLUDE (total_amount, category_id);
 CREATE INDEX IF NOT EXISTS idx_receipt_items_receipt_id ON receipt_items(receipt_id);
 
 -- ==========================================
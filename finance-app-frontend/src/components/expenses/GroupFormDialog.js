@@ -0,0 +1,63 @@
+import React, { useState } from 'react';
+import { useToast } from '../../context/ToastContext';
+import { FIXED_GROUP_CATEGORIES } from '../../constants/categories';
+
+const GroupFormDialog = ({ initial, onSubmit, onClose }) => {
+    const toast = useToast();
+    const isEdit = !!initial;
+    const [form, setForm] = useState({
+        title: initial?.title || '',
+        category_type: initial?.category_type || FIXED_GROUP_CATEGORIES[0],
+    });
+
+    const handleSubmit = (e) => {
+        e.preventDefault();
+        const title = form.title.trim();
+        if (!title) { toast.show.warning('Grup adı gerekli'); return; }
+        onSubmit({ ...form, title });
+    };
+
+    return (
+        <div className="fixed inset-0 z-50 flex items-center justify-center p-4 bg-black/40 backdrop-blur-sm animate-fade-in" onClick={onClose}>
+            <div className="bg-white dark:bg-slate-900 rounded-2xl p-6 max-w-md w-full shadow-2xl border border-slate-100 dark:border-slate-800 animate-scale-in" onClick={e => e.stopPropagation()}>
+                <h3 className="text-lg font-bold text-slate-900 dark:text-white mb-4 flex items-center gap-2">
+                    <span className="material-icons-round text-indigo-600">{isEdit ? 'edit' : 'create_new_folder'}</span>
+                    {isEdit ? 'Grubu Düzenle' : 'Yeni Gider Grubu'}
+                </h3>
+                <form onSubmit={handleSubmit} className="space-y-4">
+                    <div>
+                        <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Grup Adı</label>
+                        <input
+                            autoFocus
+                            type="text"
+                            placeholder="Örn: Ev Giderleri"
+                            value={form.title}
+                            onChange={e => setForm({ ...form, title: e.target.value })}
+                            className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-indigo-500/20 text-sm font-medium"
+                        />
+                    </div>
+                    <div>
+                        <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Kategori</label>
+                        <select
+                            value={form.category_type}
+                            onChange={e => setForm({ ...form, category_type: e.target.value })}
+                            className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-indigo-500/20 text-sm font-medium"
+                        >
+                            {FIXED_GROUP_CATEGORIES.map(c => <option key={c} value={c}>{c}</option>)}
+                        </select>
+                    </div>
+                    <div className="flex gap-3 pt-2">
+                        <button type="button" onClick={onClose} className="flex-1 py-2.5 rounded-xl font-bold text-slate-600 hover:bg-slate-50 dark:hover:bg-slate-800 transition-colors">
+                            İptal
+                        </button>
+                        <button type="submit" className="flex-1 py-2.5 rounded-xl font-bold bg-slate-900 dark:bg-indigo-600 text-white hover:bg-slate-800 dark:hover:bg-indigo-700 transition-colors shadow-lg">
+                            {isEdit ? 'Güncelle' : 'Oluştur'}
+                        </button>
+                    </div>
+                </form>
+            </div>
+        </div>
+    );
+};
+
+export default GroupFormDialog;
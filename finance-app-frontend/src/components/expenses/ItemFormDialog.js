@@ -0,0 +1,84 @@
+import React, { useState } from 'react';
+import { useToast } from '../../context/ToastContext';
+
+const ItemFormDialog = ({ initialItem, onSubmit, onClose }) => {
+    const toast = useToast();
+    const isEdit = !!initialItem;
+    const [form, setForm] = useState({
+        name: initialItem?.name || '',
+        amount: initialItem ? String(initialItem.amount) : '',
+        day: initialItem ? String(initialItem.day) : '1',
+    });
+
+    const handleSubmit = (e) => {
+        e.preventDefault();
+        const name = form.name.trim();
+        const amount = parseFloat(form.amount);
+        const day = parseInt(form.day, 10);
+
+        if (!name) { toast.show.warning('Kalem adı gerekli'); return; }
+        if (isNaN(day) || day < 1 || day > 31) { toast.show.warning('Gün 1-31 arasında olmalı'); return; }
+        const finalAmount = (!form.amount && form.amount !== 0) || isNaN(amount) ? 0 : Math.max(0, amount);
+
+        onSubmit({ name, amount: finalAmount, day });
+    };
+
+    return (
+        <div className="fixed inset-0 z-50 flex items-center justify-center p-4 bg-black/40 backdrop-blur-sm animate-fade-in" onClick={onClose}>
+            <div className="bg-white dark:bg-slate-900 rounded-2xl p-6 max-w-md w-full shadow-2xl border border-slate-100 dark:border-slate-800 animate-scale-in" onClick={e => e.stopPropagation()}>
+                <h3 className="text-lg font-bold text-slate-900 dark:text-white mb-4 flex items-center gap-2">
+                    <span className="material-icons-round text-indigo-600">{isEdit ? 'edit' : 'add_circle'}</span>
+                    {isEdit ? 'Kalemi Düzenle' : 'Yeni Gider Kalemi'}
+                </h3>
+                <form onSubmit={handleSubmit} className="space-y-4">
+                    <div>
+                        <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Kalem Adı</label>
+                        <input
+                            autoFocus
+                            type="text"
+                            placeholder="Örn: Elektrik Faturası"
+                            value={form.name}
+                            onChange={e => setForm({ ...form, name: e.target.value })}
+                            className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-indigo-500/20 text-sm font-medium"
+                        />
+                    </div>
+                    <div className="grid grid-cols-2 gap-4">
+                        <div>
+                            <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Tutar (TL) <span className="normal-case text-slate-400 font-normal">- isteğe bağlı</span></label>
+                            <input
+                                type="number"
+                                step="0.01"
+                                min="0"
+                                placeholder="Bilinmiyorsa boş bırakın"
+                                value={form.amount}
+                                onChange={e => setForm({ ...form, amount: e.target.value })}
+                                className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-indigo-500/20 text-sm font-bold"
+                            />
+                        </div>
+                        <div>
+                            <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Ödeme Günü</label>
+                            <input
+                                type="number"
+                                min="1"
+                                max="31"
+                                value={form.day}
+                                onChange={e => setForm({ ...form, day: e.target.value })}
+                                className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-indigo-500/20 text-sm font-medium"
+                            />
+                        </div>
+                    </div>
+                    <div className="flex gap-3 pt-2">
+                        <button type="button" onClick={onClose} className="flex-1 py-2.5 rounded-xl font-bold text-slate-600 hover:bg-slate-50 dark:hover:bg-slate-800 transition-colors">
+                            İptal
+                        </button>
+                        <button type="submit" className="flex-1 py-2.5 rounded-xl font-bold bg-slate-900 dark:bg-indigo-600 text-white hover:bg-slate-800 dark:hover:bg-indigo-700 transition-colors shadow-lg">
+                            {isEdit ? 'Güncelle' : 'Ekle'}
+                        </button>
+                    </div>
+                </form>
+            </div>
+        </div>
+    );
+};
+
+export default ItemFormDialog;
@@ -0,0 +1,88 @@
+import React, { useState } from 'react';
+import { useToast } from '../../context/ToastContext';
+
+const PaymentFormDialog = ({ item, onSubmit, onClose }) => {
+    const toast = useToast();
+    const [form, setForm] = useState({
+        payment_date: new Date().toISOString().split('T')[0],
+        amount: String(item.amount || ''),
+        note: '',
+    });
+
+    const handleSubmit = (e) => {
+        e.preventDefault();
+        const amount = parseFloat(form.amount);
+        if (isNaN(amount) || amount <= 0) { toast.show.warning('Geçerli bir tutar giriniz'); return; }
+
+        onSubmit({
+            status: 'paid',
+            payment_date: form.payment_date,
+            amount,
+            note: form.note.trim()
+        });
+    };
+
+    return (
+        <div className="fixed inset-0 z-50 flex items-center justify-center p-4 bg-black/40 backdrop-blur-sm animate-fade-in" onClick={onClose}>
+            <div className="bg-white dark:bg-slate-900 rounded-2xl p-6 max-w-md w-full shadow-2xl border border-slate-100 dark:border-slate-800 animate-scale-in" onClick={e => e.stopPropagation()}>
+                <h3 className="text-lg font-bold text-slate-900 dark:text-white mb-1 flex items-center gap-2">
+                    <span className="material-icons-round text-emerald-600">payments</span>
+                    Ödeme Kaydı Ekle
+                </h3>
+                <p className="text-sm text-slate-500 mb-4">
+                    <span className="font-bold text-slate-700 dark:text-slate-300">{item.name}</span> için ödeme bilgisi girin.
+                </p>
+                <form onSubmit={handleSubmit} className="space-y-4">
+                    <div className="grid grid-cols-2 gap-4">
+                        <div>
+                            <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Ödeme Tarihi</label>
+                            <input
+                                autoFocus
+                                type="date"
+                                value={form.payment_date}
+                                onChange={e => setForm({ ...form, payment_date: e.target.value })}
+                                className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-emerald-500/20 text-sm font-medium"
+                                required
+                            />
+                        </div>
+                        <div>
+                            <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Tutar (TL)</label>
+                            <input
+                                type="number"
+                                step="0.01"
+                                min="0"
+                                placeholder="0.00"
+                                value={form.amount}
+                                onChange={e => setForm({ ...form, amount: e.target.value })}
+                                className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-emerald-500/20 text-sm font-bold"
+                                required
+                            />
+                        </div>
+                    </div>
+                    <div>
+                        <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Not (Opsiyonel)</label>
+                        <input
+                            type="text"
+                            placeholder="Örn: Banka havalesi ile ödendi"
+                            value={form.note}
+                            onChange={e => setForm({ ...form, note: e.target.value })}
+                            className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-emerald-500/20 text-sm font-medium"
+                            maxLength={280}
+                        />
+                    </div>
+                    <div className="flex gap-3 pt-2">
+                        <button type="button" onClick={onClose} className="flex-1 py-2.5 rounded-xl font-bold text-slate-600 hover:bg-slate-50 dark:hover:bg-slate-800 transition-colors">
+                            İptal
+                        </button>
+                        <button type="submit" className="flex-1 py-2.5 rounded-xl font-bold bg-emerald-600 text-white hover:bg-emerald-700 transition-colors shadow-lg shadow-emerald-200 dark:shadow-none flex items-center justify-center gap-2">
+                            <span className="material-icons-round text-sm">check</span>
+                            Ödemeyi Kaydet
+                        </button>
+                    </div>
+                </form>
+            </div>
+        </div>
+    );
+};
+
+export default PaymentFormDialog;
@@ -1,4 +1,4 @@
-import React, { createContext, useContext, useState, useEffect } from 'react';
+import React, { createContext, useCallback, useContext, useMemo, useState, useEffect } from 'react';
 
 const ToastContext = createContext();
 
@@ -7,28 +7,31 @@ export const useToast = () => useContext(ToastContext);
 export const ToastProvider = ({ children }) => {
     const [toasts, setToasts] = useState([]);
 
-    const addToast = (message, type = 'info', duration = 3000) => {
+    const addToast = useCallback((message, type = 'info', duration = 3000) => {
         const id = Date.now();
         setToasts(prev => [...prev, { id, message, type }]);
 
         setTimeout(() => {
             setToasts(prev => prev.filter(t => t.id !== id));
         }, duration);
-    };
+    }, []);
 
     const removeToast = (id) => {
         setToasts(prev => prev.filter(t => t.id !== id));
     };
 
-    const show = {
-        success: (msg, duration) => addToast(msg, 'success', duration),
-        error: (msg, duration) => addToast(msg, 'error', duration),
-        info: (msg, duration) => addToast(msg, 'info', duration),
-        warning: (msg, duration) => addToast(msg, 'warning', duration),
-    };
+    // Stable context value so consumers can list `toast` in hook dependencies
+    const value = useMemo(() => ({
+        show: {
+            success: (msg, duration) => addToast(msg, 'success', duration),
+            error: (msg, duration) => addToast(msg, 'error', duration),
+            info: (msg, duration) => addToast(msg, 'info', duration),
+            warning: (msg, duration) => addToast(msg, 'warning', duration),
+        },
+    }), [addToast]);
 
     return (
-        <ToastContext.Provider value={{ show }}>
+        <ToastContext.Provider value={value}>
             {children}
             <div className="fixed top-4 right-4 z-50 flex flex-col gap-2 p-4 pointer-events-none">
                 {toasts.map(toast => (
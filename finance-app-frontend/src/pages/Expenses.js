@@ -1,18 +1,28 @@
-import React, { useEffect, useMemo, useState } from 'react';
+import React, { Suspense, lazy, useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import { api } from '../services/api';
 import DashboardLayout from '../components/layout/DashboardLayout';
 import { useToast } from '../context/ToastContext';
 import ConfirmDialog from '../components/ui/ConfirmDialog';
-import { FIXED_GROUP_CATEGORIES } from '../constants/categories';
+
+// Dialog code is split out of the page chunk and fetched the first time one is opened
+const GroupFormDialog = lazy(() => import('../components/expenses/GroupFormDialog'));
+const ItemFormDialog = lazy(() => import('../components/expenses/ItemFormDialog'));
+const PaymentFormDialog = lazy(() => import('../components/expenses/PaymentFormDialog'));
+
+/* formatters (one instance per option set, reused on every render) */
+const TRY_FMT = new Intl.NumberFormat('tr-TR', { style: 'currency', currency: 'TRY', maximumFractionDigits: 0 });
+const TR_DATE_FMT = new Intl.DateTimeFormat('tr-TR');
+const TR_MONTH_SHORT_FMT = new Intl.DateTimeFormat('tr-TR', { month: 'short', year: '2-digit' });
+const TR_DATE_LONG_FMT = new Intl.DateTimeFormat('tr-TR', { day: 'numeric', month: 'long', year: 'numeric' });
 
 /* helpers */
-const fmtCurrency = (v) =>
-    new Intl.NumberFormat('tr-TR', { style: 'currency', currency: 'TRY', maximumFractionDigits: 0 }).format(v || 0);
+const fmtCurrency = (v) => TRY_FMT.format(v || 0);
+
+const MONTHS = Object.freeze(['Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran', 'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık']);
 
 const fmtMonth = (iso) => {
-    const [y, m] = iso.split('-');
-    const months = ['Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran', 'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık'];
-    return `${months[parseInt(m, 10) - 1]} ${y}`;
+    const m = (iso.charCodeAt(5) - 48) * 10 + (iso.charCodeAt(6) - 48);
+    return `${MONTHS[m - 1]} ${iso.slice(0, 4)}`;
 };
 
 const toMonthKey = (d) => {
@@ -20,27 +30,407 @@ const toMonthKey = (d) => {
     return `${d.getFullYear()}-${month}`;
 };
 
+// Pure integer arithmetic on 'YYYY-MM' (no Date allocation, no UTC/local timezone drift)
 const shiftMonth = (iso, dir) => {
-    const d = new Date(iso + '-01');
-    d.setMonth(d.getMonth() + dir);
-    return toMonthKey(d);
+    const y = (iso.charCodeAt(0) - 48) * 1000 + (iso.charCodeAt(1) - 48) * 100 + (iso.charCodeAt(2) - 48) * 10 + (iso.charCodeAt(3) - 48);
+    const m = (iso.charCodeAt(5) - 48) * 10 + (iso.charCodeAt(6) - 48);
+    const t = m - 1 + dir;
+    const ny = y + Math.floor(t / 12);
+    const nm = ((t % 12) + 12) % 12 + 1;
+    return `${ny}-${nm < 10 ? '0' : ''}${nm}`;
+};
+
+const STATUS_BADGE = Object.freeze({
+    paid: Object.freeze({ label: 'Ödendi', color: 'bg-emerald-50 text-emerald-700 dark:bg-emerald-900/30 dark:text-emerald-400', icon: 'check_circle' }),
+    pending: Object.freeze({ label: 'Bekliyor', color: 'bg-amber-50 text-amber-700 dark:bg-amber-900/30 dark:text-amber-400', icon: 'schedule' }),
+    overdue: Object.freeze({ label: 'Gecikmiş', color: 'bg-red-50 text-red-700 dark:bg-red-900/30 dark:text-red-400', icon: 'error' }),
+});
+const STATUS_BADGE_CLASS = Object.freeze(Object.fromEntries(
+    Object.entries(STATUS_BADGE).map(([k, v]) => [k, `text-[10px] font-bold px-2 py-0.5 rounded-full ${v.color}`])
+));
+
+/* row class names: full strings picked per status, no per-render concatenation */
+const ITEM_CLASS = Object.freeze({
+    paid: Object.freeze({
+        toggle: 'w-8 h-8 rounded-full flex items-center justify-center flex-shrink-0 transition-all bg-emerald-100 dark:bg-emerald-900/40 text-emerald-600 dark:text-emerald-400',
+        name: 'font-bold text-sm text-slate-400 line-through',
+        amount: 'font-bold text-sm flex-shrink-0 text-emerald-600',
+    }),
+    unpaid: Object.freeze({
+        toggle: 'w-8 h-8 rounded-full flex items-center justify-center flex-shrink-0 transition-all bg-slate-100 dark:bg-slate-800 text-slate-300 dark:text-slate-600 hover:bg-emerald-50 hover:text-emerald-500',
+        name: 'font-bold text-sm text-slate-900 dark:text-white',
+        amount: 'font-bold text-sm flex-shrink-0 text-slate-900 dark:text-white',
+    }),
+});
+
+const HISTORY_CLASS = Object.freeze({
+    paid: Object.freeze({
+        chip: 'text-[9px] font-medium px-1.5 py-0.5 rounded bg-emerald-50 text-emerald-600 dark:bg-emerald-900/20 dark:text-emerald-400',
+        dot: 'absolute -left-[21px] top-1 w-3 h-3 rounded-full border-2 border-white dark:border-slate-900 bg-emerald-500',
+        amount: 'text-xs font-bold text-emerald-600',
+        badge: 'text-[9px] font-bold px-1.5 py-0.5 rounded-full bg-emerald-50 text-emerald-600 dark:bg-emerald-900/20 dark:text-emerald-400',
+    }),
+    unpaid: Object.freeze({
+        chip: 'text-[9px] font-medium px-1.5 py-0.5 rounded bg-slate-100 text-slate-400 dark:bg-slate-800 dark:text-slate-500',
+        dot: 'absolute -left-[21px] top-1 w-3 h-3 rounded-full border-2 border-white dark:border-slate-900 bg-slate-300 dark:bg-slate-600',
+        amount: 'text-xs font-bold text-amber-500',
+        badge: 'text-[9px] font-bold px-1.5 py-0.5 rounded-full bg-amber-50 text-amber-600 dark:bg-amber-900/20 dark:text-amber-400',
+    }),
+});
+
+const CATEGORY_ICON_MAP = new Map([
+    ['Kira', 'home'],
+    ['Fatura', 'receipt_long'],
+    ['Abonelik', 'subscriptions'],
+    ['Kredi', 'credit_card'],
+    ['Eğitim', 'school'],
+    ['Diğer', 'more_horiz'],
+]);
+
+const MONTH_CACHE_LIMIT = 12;
+const EMPTY_STATS = { total: 0, paid: 0, remaining: 0, count: 0, pending_count: 0 };
+
+const toCacheEntry = (res) => ({ groups: res.data || [], stats: res.stats || EMPTY_STATS });
+
+const rememberMonth = (cache, month, entry) => {
+    cache.delete(month);
+    cache.set(month, entry);
+    if (cache.size > MONTH_CACHE_LIMIT) {
+        cache.delete(cache.keys().next().value);
+    }
+};
+
+const whenIdle = (fn) => (
+    typeof window.requestIdleCallback === 'function'
+        ? window.requestIdleCallback(fn)
+        : setTimeout(fn, 300)
+);
+
+/* local state patches (optimistic updates) */
+// Also keeps the server-computed group aggregates (paid_count, remaining_amount) in step
+const patchItemStatus = (groups, itemId, status) => groups.map(g => {
+    const items = g.items || [];
+    const target = items.find(i => i.id === itemId);
+    if (!target) return g;
+    const delta = (status === 'paid' ? 1 : 0) - (target.status === 'paid' ? 1 : 0);
+    return {
+        ...g,
+        paid_count: (g.paid_count || 0) + delta,
+        remaining_amount: Math.max((g.remaining_amount || 0) - delta * (target.amount || 0), 0),
+        items: items.map(i => (i.id === itemId ? { ...i, status } : i)),
+    };
+});
+
+const shiftPaidStats = (stats, amount, toPaid) => {
+    const delta = toPaid ? (amount || 0) : -(amount || 0);
+    return {
+        ...stats,
+        paid: stats.paid + delta,
+        remaining: Math.max(stats.remaining - delta, 0),
+        pending_count: stats.pending_count + (toPaid ? -1 : 1),
+    };
 };
 
-const STATUS_BADGE = {
-    paid: { label: 'Ödendi', color: 'bg-emerald-50 text-emerald-700 dark:bg-emerald-900/30 dark:text-emerald-400', icon: 'check_circle' },
-    pending: { label: 'Bekliyor', color: 'bg-amber-50 text-amber-700 dark:bg-amber-900/30 dark:text-amber-400', icon: 'schedule' },
-    overdue: { label: 'Gecikmiş', color: 'bg-red-50 text-red-700 dark:bg-red-900/30 dark:text-red-400', icon: 'error' },
+/* local CRUD patches (mirror the server's group aggregates and month stats) */
+const round2 = (v) => Math.round(v * 100) / 100;
+
+const withGroupTotals = (g) => {
+    const items = g.items || [];
+    let total = 0, paid = 0, paidCount = 0;
+    for (const i of items) {
+        total += i.amount || 0;
+        if (i.status === 'paid') { paid += i.amount || 0; paidCount++; }
+    }
+    return { ...g, items, items_count: items.length, paid_count: paidCount, total_amount: round2(total), remaining_amount: round2(Math.max(total - paid, 0)) };
 };
 
-const CATEGORY_ICONS = {
-    Kira: 'home',
-    Fatura: 'receipt_long',
-    Abonelik: 'subscriptions',
-    Kredi: 'credit_card',
-    'Eğitim': 'school',
-    'Diğer': 'more_horiz',
+const statsFromGroups = (groups) => {
+    let total = 0, remaining = 0, count = 0, paidCount = 0;
+    for (const g of groups) {
+        total += g.total_amount || 0;
+        remaining += g.remaining_amount || 0;
+        count += g.items_count || 0;
+        paidCount += g.paid_count || 0;
+    }
+    return { total: round2(total), paid: round2(total - remaining), remaining: round2(remaining), count, pending_count: count - paidCount };
 };
 
+// Same rule as the backend: unpaid items past their due day in the current month are overdue
+const dueStatus = (month, day) => {
+    const now = new Date();
+    if (month !== toMonthKey(now)) return 'pending';
+    const lastDay = new Date(now.getFullYear(), now.getMonth() + 1, 0).getDate();
+    return Math.min(day, lastDay) < now.getDate() ? 'overdue' : 'pending';
+};
+
+const toLocalItem = (row, month) => ({
+    id: row.id,
+    name: row.name,
+    amount: Number(row.amount) || 0,
+    day: row.due_day,
+    status: dueStatus(month, row.due_day),
+    month_payment: null,
+    history: [],
+});
+
+const mapGroup = (groups, groupId, fn) => groups.map(g => (g.id === groupId ? withGroupTotals(fn(g)) : g));
+
+/* rows */
+const sameItemRowProps = (p, n) =>
+    p.item.id === n.item.id
+    && p.item.status === n.item.status
+    && p.item.amount === n.item.amount
+    && p.item.name === n.item.name
+    && p.item.day === n.item.day
+    && p.item.month_payment === n.item.month_payment
+    && p.item.history === n.item.history
+    && p.historyExpanded === n.historyExpanded
+    && p.style === n.style;
+
+// Long groups: let the browser skip layout/paint of offscreen rows ('auto' keeps the last measured height)
+const LARGE_GROUP_THRESHOLD = 20;
+const DEFERRED_ROW_STYLE = Object.freeze({ contentVisibility: 'auto', containIntrinsicSize: 'auto 72px' });
+
+// Row buttons carry data-action/data-id only; GroupCard handles clicks with one delegated listener
+const ExpenseItemRow = React.memo(function ExpenseItemRow({ item, historyExpanded, style }) {
+    const badgeKey = STATUS_BADGE[item.status] ? item.status : 'pending';
+    const sb = STATUS_BADGE[badgeKey];
+    const cls = item.status === 'paid' ? ITEM_CLASS.paid : ITEM_CLASS.unpaid;
+    return (
+        <div className="p-4 hover:bg-slate-50/50 dark:hover:bg-slate-800/30 transition-colors group/item" style={style}>
+            <div className="flex items-center gap-4">
+                {/* Payment Toggle */}
+                <button
+                    data-action="toggle"
+                    data-id={item.id}
+                    className={cls.toggle}
+                    title={item.status === 'paid' ? 'Bekliyora çevir' : 'Ödendi olarak işaretle'}
+                >
+                    <span className="material-icons-round text-lg">
+                        {item.status === 'paid' ? 'check' : 'radio_button_unchecked'}
+                    </span>
+                </button>
+
+                {/* Info */}
+                <div className="flex-1 min-w-0">
+                    <div className="flex items-center gap-2 flex-wrap">
+                        <p className={cls.name}>
+                            {item.name}
+                        </p>
+                        <span className={STATUS_BADGE_CLASS[badgeKey]}>
+                            {sb.label}
+                        </span>
+                    </div>
+                    <p className="text-xs text-slate-400 mt-0.5">
+                        Her ayın {item.day}. günü
+                        {item.month_payment?.payment_date && ` — Son ödeme: ${TR_DATE_FMT.format(new Date(item.month_payment.payment_date))}`}
+                    </p>
+                </div>
+
+                {/* Amount */}
+                <p className={cls.amount}>
+                    {fmtCurrency(item.amount)}
+                </p>
+
+                {/* Actions */}
+                <div className="flex items-center gap-0.5 opacity-0 group-hover/item:opacity-100 transition-opacity flex-shrink-0">
+                    <button
+                        data-action="payment"
+                        data-id={item.id}
+                        className="p-1.5 rounded-lg text-slate-400 hover:text-emerald-600 hover:bg-emerald-50 dark:hover:bg-emerald-900/20 transition-all"
+                        title="Ödeme Kaydı Ekle"
+                    >
+                        <span className="material-icons-round text-base">add_card</span>
+                    </button>
+                    <button
+                        data-action="edit"
+                        data-id={item.id}
+                        className="p-1.5 rounded-lg text-slate-400 hover:text-slate-700 hover:bg-slate-100 dark:hover:bg-slate-800 transition-all"
+                        title="Düzenle"
+                    >
+                        <span className="material-icons-round text-base">edit</span>
+                    </button>
+                    <button
+                        data-action="delete"
+                        data-id={item.id}
+                        className="p-1.5 rounded-lg text-slate-400 hover:text-red-600 hover:bg-red-50 dark:hover:bg-red-900/20 transition-all"
+                        title="Sil"
+                    >
+                        <span className="material-icons-round text-base">delete_outline</span>
+                    </button>
+                </div>
+            </div>
+
+            {/* Payment History */}
+            {item.history && item.history.length > 0 && (
+                <div className="ml-12 mt-2">
+                    <button
+                        data-action="history"
+                        data-id={item.id}
+                        className="flex items-center gap-1.5 text-xs text-slate-400 hover:text-indigo-600 transition-colors mb-1.5"
+                    >
+                        <span className="material-icons-round text-sm" style={{ transition: 'transform 0.2s', transform: historyExpanded ? 'rotate(90deg)' : 'rotate(0deg)' }}>chevron_right</span>
+                        <span className="font-bold">Ödeme Geçmişi ({item.history.length})</span>
+                    </button>
+
+                    {/* Collapsed: mini badge view */}
+                    {!historyExpanded && (
+                        <div className="flex items-center gap-1 flex-wrap">
+                            {item.history.slice(0, 6).map((h, idx) => (
+                                <span
+                                    key={idx}
+                                    className={(h.status === 'paid' ? HISTORY_CLASS.paid : HISTORY_CLASS.unpaid).chip}
+                                    title={`${TR_DATE_FMT.format(new Date(h.date))} — ${fmtCurrency(h.amount)}${h.note ? ' — ' + h.note : ''}`}
+                                >
+                                    {TR_MONTH_SHORT_FMT.format(new Date(h.date))}
+                                </span>
+                            ))}
+                            {item.history.length > 6 && (
+                                <span className="text-[9px] text-slate-400 font-medium">+{item.history.length - 6}</span>
+                            )}
+                        </div>
+                    )}
+
+                    {/* Expanded: full timeline */}
+                    {historyExpanded && (
+                        <div className="relative pl-4 border-l-2 border-slate-100 dark:border-slate-800 space-y-2 mt-1">
+                            {item.history.map((h, idx) => (
+                                <div key={idx} className="relative">
+                                    <div className={(h.status === 'paid' ? HISTORY_CLASS.paid : HISTORY_CLASS.unpaid).dot}></div>
+                                    <div className="flex items-center gap-2 flex-wrap">
+                                        <span className="text-xs font-bold text-slate-700 dark:text-slate-300">
+                                            {TR_DATE_LONG_FMT.format(new Date(h.date))}
+                                        </span>
+                                        <span className={(h.status === 'paid' ? HISTORY_CLASS.paid : HISTORY_CLASS.unpaid).amount}>
+                                            {fmtCurrency(h.amount)}
+                                        </span>
+                                        <span className={(h.status === 'paid' ? HISTORY_CLASS.paid : HISTORY_CLASS.unpaid).badge}>
+                                            {h.status === 'paid' ? 'Ödendi' : 'Bekliyor'}
+                                        </span>
+                                    </div>
+                                    {h.note && (
+                                        <p className="text-[10px] text-slate-400 mt-0.5 italic">💬 {h.note}</p>
+                                    )}
+                                </div>
+                            ))}
+                        </div>
+                    )}
+                </div>
+            )}
+
+            {/* No history yet - subtle link */}
+            {(!item.history || item.history.length === 0) && (
+                <div className="ml-12 mt-1">
+                    <button
+                        data-action="payment"
+                        data-id={item.id}
+                        className="text-[10px] text-slate-300 hover:text-emerald-500 transition-colors flex items-center gap-1"
+                    >
+                        <span className="material-icons-round text-xs">add_circle_outline</span>
+                        İlk ödeme kaydını ekle
+                    </button>
+                </div>
+            )}
+        </div>
+    );
+}, sameItemRowProps);
+
+const GroupCard = React.memo(function GroupCard({ group, expandedHistory, onAddItem, onEditGroup, onDeleteGroup, onToggleItem, onEditItem, onDeleteItem, onAddPayment, onToggleHistory }) {
+    const onItemAction = useCallback((e) => {
+        const btn = e.target.closest('[data-action]');
+        if (!btn) return;
+        const id = btn.dataset.id;
+        const item = group.items.find(i => String(i.id) === id);
+        if (!item) return;
+        switch (btn.dataset.action) {
+            case 'toggle': onToggleItem(item); break;
+            case 'payment': onAddPayment(item); break;
+            case 'edit': onEditItem(item, group.id); break;
+            case 'delete': onDeleteItem(item); break;
+            case 'history': onToggleHistory(item.id); break;
+            default: break;
+        }
+    }, [group, onToggleItem, onAddPayment, onEditItem, onDeleteItem, onToggleHistory]);
+
+    const rowStyle = group.items && group.items.length > LARGE_GROUP_THRESHOLD ? DEFERRED_ROW_STYLE : undefined;
+
+    return (
+        <div className="bg-white dark:bg-slate-900 rounded-2xl border border-slate-200 dark:border-slate-800 shadow-sm overflow-hidden">
+            {/* Group Header */}
+            <div className="p-5 border-b border-slate-100 dark:border-slate-800 flex flex-col sm:flex-row justify-between items-start sm:items-center gap-3">
+                <div className="flex items-center gap-3 min-w-0">
+                    <div className="w-10 h-10 rounded-xl bg-indigo-50 dark:bg-indigo-900/30 flex items-center justify-center flex-shrink-0">
+                        <span className="material-icons-round text-indigo-600 dark:text-indigo-400">{CATEGORY_ICON_MAP.get(group.category_type) ?? 'folder'}</span>
+                    </div>
+                    <div className="min-w-0">
+                        <h3 className="font-bold text-slate-900 dark:text-white text-base truncate">{group.title}</h3>
+                        <div className="flex items-center gap-2">
+                            <span className="text-xs text-slate-400 font-medium">{group.category_type}</span>
+                            <span className="text-xs text-slate-300 dark:text-slate-600">|</span>
+                            <span className="text-xs text-slate-400">{group.paid_count ?? 0}/{group.items_count ?? 0} ödendi</span>
+                            {group.total_amount > 0 && (
+                                <>
+                                    <span className="text-xs text-slate-300 dark:text-slate-600">|</span>
+                                    <span className="text-xs font-bold text-slate-600 dark:text-slate-300">{fmtCurrency(group.total_amount)}</span>
+                                </>
+                            )}
+                        </div>
+                    </div>
+                </div>
+                <div className="flex items-center gap-1 flex-shrink-0">
+                    <button
+                        onClick={() => onAddItem(group.id)}
+                        className="p-2 rounded-lg text-slate-400 hover:text-indigo-600 hover:bg-indigo-50 dark:hover:bg-indigo-900/20 transition-all"
+                        title="Kalem Ekle"
+                    >
+                        <span className="material-icons-round text-lg">add_circle_outline</span>
+                    </button>
+                    <button
+                        onClick={() => onEditGroup(group)}
+                        className="p-2 rounded-lg text-slate-400 hover:text-slate-700 hover:bg-slate-50 dark:hover:bg-slate-800 transition-all"
+                        title="Düzenle"
+                    >
+                        <span className="material-icons-round text-lg">edit</span>
+                    </button>
+                    <button
+                        onClick={() => onDeleteGroup(group)}
+                        className="p-2 rounded-lg text-slate-400 hover:text-red-600 hover:bg-red-50 dark:hover:bg-red-900/20 transition-all"
+                        title="Sil"
+                    >
+                        <span className="material-icons-round text-lg">delete_outline</span>
+                    </button>
+                </div>
+            </div>
+
+            {/* Items */}
+            {(!group.items || group.items.length === 0) ? (
+                <div className="p-8 text-center text-slate-400">
+                    <span className="material-icons-round text-3xl opacity-20 mb-2 block">inbox</span>
+                    <p className="text-sm">Bu grupta henüz kalem yok.</p>
+                    <button
+                        onClick={() => onAddItem(group.id)}
+                        className="mt-3 text-indigo-600 hover:text-indigo-700 text-sm font-bold inline-flex items-center gap-1"
+                    >
+                        <span className="material-icons-round text-sm">add</span>
+                        Kalem Ekle
+                    </button>
+                </div>
+            ) : (
+                <div className="divide-y divide-slate-50 dark:divide-slate-800" onClick={onItemAction}>
+                    {group.items.map(item => (
+                        <ExpenseItemRow
+                            key={item.id}
+                            item={item}
+                            historyExpanded={!!expandedHistory[item.id]}
+                            style={rowStyle}
+                        />
+                    ))}
+                </div>
+            )}
+        </div>
+    );
+});
+
 /* component */
 const Expenses = () => {
     const toast = useToast();
@@ -48,8 +438,10 @@ const Expenses = () => {
     /* state */
     const [month, setMonth] = useState(toMonthKey(new Date()));
     const [groups, setGroups] = useState([]);
-    const [stats, setStats] = useState({ total: 0, paid: 0, remaining: 0, count: 0, pending_count: 0 });
+    const [stats, setStats] = useState(EMPTY_STATS);
     const [loading, setLoading] = useState(true);
+    const [isRefreshing, setIsRefreshing] = useState(false);
+    const hasLoadedOnce = useRef(false); // after the first payload, refetches keep the current DOM
 
     /* dialogs */
     const [showGroupForm, setShowGroupForm] = useState(false);
@@ -60,166 +452,232 @@ const Expenses = () => {
     const [showPaymentForm, setShowPaymentForm] = useState(null); // item object
     const [expandedHistory, setExpandedHistory] = useState({}); // { itemId: true }
 
-    /* forms */
-    const [groupForm, setGroupForm] = useState({ title: '', category_type: FIXED_GROUP_CATEGORIES[0] });
-    const [itemForm, setItemForm] = useState({ name: '', amount: '', day: '1' });
-    const [paymentForm, setPaymentForm] = useState({ payment_date: new Date().toISOString().split('T')[0], amount: '', note: '' });
+    /* month payload cache: { 'YYYY-MM' => { groups, stats } }, insertion order = recency */
+    const cache = useRef(new Map());
+    /* bumped whenever local edits invalidate the cache; older prefetches are dropped */
+    const cacheGen = useRef(0);
 
     /* fetch */
-    // eslint-disable-next-line react-hooks/exhaustive-deps
-    useEffect(() => { fetchData(); }, [month]);
-
-    const fetchData = async () => {
+    const fetchData = useCallback(async (signal) => {
         try {
-            setLoading(true);
-            const res = await api.getFixedExpenses(month);
-            setGroups(res.data || []);
-            setStats(res.stats || { total: 0, paid: 0, remaining: 0, count: 0, pending_count: 0 });
+            if (hasLoadedOnce.current && !cache.current.has(month)) setIsRefreshing(true);
+            const res = await api.getFixedExpenses(month, { signal });
+            const entry = toCacheEntry(res);
+            setGroups(entry.groups);
+            setStats(entry.stats);
+            hasLoadedOnce.current = true;
+            rememberMonth(cache.current, month, entry);
+
+            // Warm the neighbouring months so chevron clicks resolve from cache
+            whenIdle(() => {
+                const gen = cacheGen.current;
+                for (const m of [shiftMonth(month, -1), shiftMonth(month, 1)]) {
+                    if (cache.current.has(m)) continue;
+                    api.getFixedExpenses(m)
+                        .then(r => { if (gen === cacheGen.current && !cache.current.has(m)) rememberMonth(cache.current, m, toCacheEntry(r)); })
+                        .catch(() => { });
+                }
+            });
         } catch (err) {
+            if (signal?.aborted) return; // superseded by a newer month
             toast.show.error('Sabit giderler yüklenemedi');
         } finally {
+            if (!signal?.aborted) {
+                setLoading(false);
+                setIsRefreshing(false);
+            }
+        }
+    }, [month, toast]);
+
+    // Coalesce rapid month navigation: only the settled month fetches, in-flight ones are aborted
+    // A cached month is shown instantly and revalidated in the background.
+    useEffect(() => {
+        const hit = cache.current.get(month);
+        if (hit) {
+            setGroups(hit.groups);
+            setStats(hit.stats);
             setLoading(false);
+            setIsRefreshing(false);
         }
-    };
+        const ctrl = new AbortController();
+        const t = setTimeout(() => fetchData(ctrl.signal), 120);
+        return () => {
+            clearTimeout(t);
+            ctrl.abort();
+        };
+    }, [month, fetchData]);
+
+    // CRUD results are applied locally instead of refetching. Group/item edits affect every
+    // month, so other cached months are dropped and revalidate on their next visit.
+    const applyGroups = useCallback((next) => {
+        const nextStats = statsFromGroups(next);
+        setGroups(next);
+        setStats(nextStats);
+        cacheGen.current += 1;
+        cache.current.clear();
+        rememberMonth(cache.current, month, { groups: next, stats: nextStats });
+    }, [month]);
 
     /* group CRUD */
-    const handleGroupSubmit = async (e) => {
-        e.preventDefault();
-        const title = groupForm.title.trim();
-        if (!title) { toast.show.warning('Grup adı gerekli'); return; }
+    const closeGroupForm = useCallback(() => {
+        setShowGroupForm(false);
+        setEditGroup(null);
+    }, []);
 
+    const handleGroupSubmit = useCallback(async (values) => {
         try {
             if (editGroup) {
-                await api.updateFixedExpenseGroup(editGroup.id, groupForm);
+                const updated = await api.updateFixedExpenseGroup(editGroup.id, values);
+                applyGroups(groups.map(g => (g.id === updated.id ? { ...g, title: updated.title, category_type: updated.category_type } : g)));
                 toast.show.success('Grup güncellendi');
             } else {
-                await api.createFixedExpenseGroup(groupForm);
+                const created = await api.createFixedExpenseGroup(values);
+                // newest first, same as the server ordering
+                applyGroups([withGroupTotals({ id: created.id, title: created.title, category_type: created.category_type || 'Diger', items: [] }), ...groups]);
                 toast.show.success('Yeni grup oluşturuldu');
             }
-            resetGroupForm();
-            fetchData();
+            closeGroupForm();
         } catch {
             toast.show.error(editGroup ? 'Güncelleme başarısız' : 'Oluşturma başarısız');
         }
-    };
+    }, [editGroup, groups, applyGroups, closeGroupForm, toast]);
 
-    const resetGroupForm = () => {
-        setShowGroupForm(false);
+    const openNewGroup = useCallback(() => {
         setEditGroup(null);
-        setGroupForm({ title: '', category_type: FIXED_GROUP_CATEGORIES[0] });
-    };
+        setShowGroupForm(true);
+    }, []);
 
-    const openEditGroup = (g) => {
+    const openEditGroup = useCallback((g) => {
         setEditGroup(g);
-        setGroupForm({ title: g.title, category_type: g.category_type || FIXED_GROUP_CATEGORIES[0] });
         setShowGroupForm(true);
-    };
+    }, []);
 
     /* item CRUD */
-    const handleItemSubmit = async (e) => {
-        e.preventDefault();
-        const name = itemForm.name.trim();
-        const amount = parseFloat(itemForm.amount);
-        const day = parseInt(itemForm.day, 10);
-
-        if (!name) { toast.show.warning('Kalem adı gerekli'); return; }
-        if (isNaN(day) || day < 1 || day > 31) { toast.show.warning('Gün 1-31 arasında olmalı'); return; }
-        const finalAmount = (!itemForm.amount && itemForm.amount !== 0) || isNaN(amount) ? 0 : Math.max(0, amount);
+    const closeItemForm = useCallback(() => {
+        setShowItemForm(null);
+        setEditItem(null);
+    }, []);
 
+    const handleItemSubmit = useCallback(async (values) => {
         try {
             if (editItem) {
-                await api.updateFixedExpenseItem(editItem.id, { name, amount: finalAmount, day });
+                const updated = await api.updateFixedExpenseItem(editItem.id, values);
+                applyGroups(mapGroup(groups, showItemForm, g => ({
+                    ...g,
+                    items: g.items
+                        .map(i => (i.id === updated.id ? {
+                            ...i,
+                            name: updated.name,
+                            amount: Number(updated.amount) || 0,
+                            day: updated.due_day,
+                            status: i.month_payment ? i.status : dueStatus(month, updated.due_day),
+                        } : i))
+                        .sort((a, b) => a.day - b.day),
+                })));
                 toast.show.success('Kalem güncellendi');
             } else {
-                await api.addFixedExpenseItem({ group_id: showItemForm, name, amount: finalAmount, day });
+                const created = await api.addFixedExpenseItem({ group_id: showItemForm, ...values });
+                const item = toLocalItem(created, month);
+                applyGroups(mapGroup(groups, showItemForm, g => ({
+                    ...g,
+                    items: [...(g.items || []), item].sort((a, b) => a.day - b.day),
+                })));
                 toast.show.success('Kalem eklendi');
             }
-            resetItemForm();
-            fetchData();
+            closeItemForm();
         } catch {
             toast.show.error('İşlem başarısız');
         }
-    };
+    }, [editItem, showItemForm, groups, month, applyGroups, closeItemForm, toast]);
 
-    const resetItemForm = () => {
-        setShowItemForm(null);
+    const openAddItem = useCallback((groupId) => {
         setEditItem(null);
-        setItemForm({ name: '', amount: '', day: '1' });
-    };
+        setShowItemForm(groupId);
+    }, []);
 
-    const openEditItem = (item, groupId) => {
+    const openEditItem = useCallback((item, groupId) => {
         setEditItem(item);
         setShowItemForm(groupId);
-        setItemForm({ name: item.name, amount: String(item.amount), day: String(item.day) });
-    };
+    }, []);
 
     /* payment toggle */
-    const handlePaymentToggle = async (item) => {
-        const newStatus = item.status === 'paid' ? 'pending' : 'paid';
+    // Optimistic: patch local state immediately, revert only if the request fails
+    const handlePaymentToggle = useCallback(async (item) => {
+        const prevStatus = item.status;
+        const toPaid = prevStatus !== 'paid';
+        const newStatus = toPaid ? 'paid' : 'pending';
+        setGroups(prev => patchItemStatus(prev, item.id, newStatus));
+        setStats(prev => shiftPaidStats(prev, item.amount, toPaid));
         try {
             await api.saveFixedExpensePayment(item.id, { status: newStatus, month });
-            fetchData();
-            toast.show.success(newStatus === 'paid' ? 'Ödendi olarak işaretlendi' : 'Bekliyora çevrildi');
+            // Keep the month cache in step, otherwise revisiting the month flashes the old status
+            const hit = cache.current.get(month);
+            const cachedItem = hit && hit.groups.flatMap(g => g.items || []).find(i => i.id === item.id);
+            if (cachedItem && cachedItem.status !== newStatus) {
+                rememberMonth(cache.current, month, {
+                    groups: patchItemStatus(hit.groups, item.id, newStatus),
+                    stats: shiftPaidStats(hit.stats, item.amount, toPaid),
+                });
+            }
+            toast.show.success(toPaid ? 'Ödendi olarak işaretlendi' : 'Bekliyora çevrildi');
         } catch {
+            setGroups(prev => patchItemStatus(prev, item.id, prevStatus));
+            setStats(prev => shiftPaidStats(prev, item.amount, !toPaid));
+            cache.current.delete(month);
             toast.show.error('Durum güncellenemedi');
         }
-    };
+    }, [month, toast]);
 
     /* payment record */
-    const openPaymentForm = (item) => {
-        setShowPaymentForm(item);
-        setPaymentForm({ payment_date: new Date().toISOString().split('T')[0], amount: String(item.amount || ''), note: '' });
-    };
+    const openPaymentForm = useCallback((item) => setShowPaymentForm(item), []);
+    const closePaymentForm = useCallback(() => setShowPaymentForm(null), []);
 
-    const handlePaymentSubmit = async (e) => {
-        e.preventDefault();
+    const handlePaymentSubmit = useCallback(async (values) => {
         if (!showPaymentForm) return;
-        const amount = parseFloat(paymentForm.amount);
-        if (isNaN(amount) || amount <= 0) { toast.show.warning('Geçerli bir tutar giriniz'); return; }
-
         try {
-            await api.saveFixedExpensePayment(showPaymentForm.id, {
-                status: 'paid',
-                payment_date: paymentForm.payment_date,
-                amount,
-                note: paymentForm.note.trim()
-            });
+            await api.saveFixedExpensePayment(showPaymentForm.id, values);
             toast.show.success('Ödeme kaydedildi');
             setShowPaymentForm(null);
             fetchData();
         } catch {
             toast.show.error('Ödeme kaydedilemedi');
         }
-    };
+    }, [showPaymentForm, fetchData, toast]);
 
-    const toggleHistory = (itemId) => {
+    const toggleHistory = useCallback((itemId) => {
         setExpandedHistory(prev => ({ ...prev, [itemId]: !prev[itemId] }));
-    };
+    }, []);
 
     /* delete */
-    const handleDeleteConfirm = async () => {
+    const confirmDeleteGroup = useCallback((group) => setDeleteTarget({ type: 'group', id: group.id, label: group.title }), []);
+    const confirmDeleteItem = useCallback((item) => setDeleteTarget({ type: 'item', id: item.id, label: item.name }), []);
+
+    const handleDeleteConfirm = useCallback(async () => {
         if (!deleteTarget) return;
         try {
             if (deleteTarget.type === 'group') {
                 await api.deleteFixedExpenseGroup(deleteTarget.id);
+                applyGroups(groups.filter(g => g.id !== deleteTarget.id));
             } else {
                 await api.deleteFixedExpenseItem(deleteTarget.id);
+                applyGroups(groups.map(g => ((g.items || []).some(i => i.id === deleteTarget.id)
+                    ? withGroupTotals({ ...g, items: g.items.filter(i => i.id !== deleteTarget.id) })
+                    : g)));
             }
             toast.show.success(`${deleteTarget.label} silindi`);
-            fetchData();
         } catch {
             toast.show.error('Silme başarısız');
         } finally {
             setDeleteTarget(null);
         }
-    };
+    }, [deleteTarget, groups, applyGroups, toast]);
 
     /* derived */
     const paidPct = useMemo(() => (stats.total > 0 ? Math.round((stats.paid / stats.total) * 100) : 0), [stats]);
     const isCurrentMonth = month === toMonthKey(new Date());
 
     /* render */
-    if (loading) {
+    if (loading && !hasLoadedOnce.current) {
         return (
             <DashboardLayout>
                 <div className="flex items-center justify-center min-h-[400px]">
@@ -248,7 +706,7 @@ const Expenses = () => {
                     <p className="text-slate-500 text-sm mt-1">Sabit giderlerinizi gruplar halinde takip edin.</p>
                 </div>
                 <button
-                    onClick={() => { resetGroupForm(); setShowGroupForm(true); }}
+                    onClick={openNewGroup}
                     className="bg-slate-900 dark:bg-indigo-600 hover:bg-slate-800 dark:hover:bg-indigo-700 text-white px-4 py-2.5 rounded-xl flex items-center gap-2 font-bold text-sm shadow-lg shadow-slate-200 dark:shadow-none transition-all"
                 >
                     <span className="material-icons-round text-lg">add</span>
@@ -256,6 +714,9 @@ const Expenses = () => {
                 </button>
             </div>
 
+            {/* Background refetch indicator (previous month stays rendered meanwhile) */}
+            <div className="h-0.5 -mt-1 mb-0.5 bg-indigo-500 rounded-full animate-pulse" hidden={!isRefreshing} />
+
             {/* Month Nav */}
             <div className="flex items-center justify-between mb-6 bg-white dark:bg-slate-900 p-4 rounded-2xl shadow-sm border border-slate-200 dark:border-slate-800">
                 <button onClick={() => setMonth(shiftMonth(month, -1))} className="p-2 rounded-xl hover:bg-slate-100 dark:hover:bg-slate-800 transition-colors">
@@ -295,169 +756,18 @@ const Expenses = () => {
                 </div>
             </div>
 
-            {/* Group Form Dialog */}
-            {showGroupForm && (
-                <div className="fixed inset-0 z-50 flex items-center justify-center p-4 bg-black/40 backdrop-blur-sm animate-fade-in" onClick={() => resetGroupForm()}>
-                    <div className="bg-white dark:bg-slate-900 rounded-2xl p-6 max-w-md w-full shadow-2xl border border-slate-100 dark:border-slate-800 animate-scale-in" onClick={e => e.stopPropagation()}>
-                        <h3 className="text-lg font-bold text-slate-900 dark:text-white mb-4 flex items-center gap-2">
-                            <span className="material-icons-round text-indigo-600">{editGroup ? 'edit' : 'create_new_folder'}</span>
-                            {editGroup ? 'Grubu Düzenle' : 'Yeni Gider Grubu'}
-                        </h3>
-                        <form onSubmit={handleGroupSubmit} className="space-y-4">
-                            <div>
-                                <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Grup Adı</label>
-                                <input
-                                    autoFocus
-                                    type="text"
-                                    placeholder="Örn: Ev Giderleri"
-                                    value={groupForm.title}
-                                    onChange={e => setGroupForm({ ...groupForm, title: e.target.value })}
-                                    className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-indigo-500/20 text-sm font-medium"
-                                />
-                            </div>
-                            <div>
-                                <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Kategori</label>
-                                <select
-                                    value={groupForm.category_type}
-                                    onChange={e => setGroupForm({ ...groupForm, category_type: e.target.value })}
-                                    className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-indigo-500/20 text-sm font-medium"
-                                >
-                                    {FIXED_GROUP_CATEGORIES.map(c => <option key={c} value={c}>{c}</option>)}
-                                </select>
-                            </div>
-                            <div className="flex gap-3 pt-2">
-                                <button type="button" onClick={resetGroupForm} className="flex-1 py-2.5 rounded-xl font-bold text-slate-600 hover:bg-slate-50 dark:hover:bg-slate-800 transition-colors">
-                                    İptal
-                                </button>
-                                <button type="submit" className="flex-1 py-2.5 rounded-xl font-bold bg-slate-900 dark:bg-indigo-600 text-white hover:bg-slate-800 dark:hover:bg-indigo-700 transition-colors shadow-lg">
-                                    {editGroup ? 'Güncelle' : 'Oluştur'}
-                                </button>
-                            </div>
-                        </form>
-                    </div>
-                </div>
-            )}
-
-            {/* Item Form Dialog */}
-            {showItemForm && (
-                <div className="fixed inset-0 z-50 flex items-center justify-center p-4 bg-black/40 backdrop-blur-sm animate-fade-in" onClick={() => resetItemForm()}>
-                    <div className="bg-white dark:bg-slate-900 rounded-2xl p-6 max-w-md w-full shadow-2xl border border-slate-100 dark:border-slate-800 animate-scale-in" onClick={e => e.stopPropagation()}>
-                        <h3 className="text-lg font-bold text-slate-900 dark:text-white mb-4 flex items-center gap-2">
-                            <span className="material-icons-round text-indigo-600">{editItem ? 'edit' : 'add_circle'}</span>
-                            {editItem ? 'Kalemi Düzenle' : 'Yeni Gider Kalemi'}
-                        </h3>
-                        <form onSubmit={handleItemSubmit} className="space-y-4">
-                            <div>
-                                <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Kalem Adı</label>
-                                <input
-                                    autoFocus
-                                    type="text"
-                                    placeholder="Örn: Elektrik Faturası"
-                                    value={itemForm.name}
-                                    onChange={e => setItemForm({ ...itemForm, name: e.target.value })}
-                                    className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-indigo-500/20 text-sm font-medium"
-                                />
-                            </div>
-                            <div className="grid grid-cols-2 gap-4">
-                                <div>
-                                    <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Tutar (TL) <span className="normal-case text-slate-400 font-normal">- isteğe bağlı</span></label>
-                                    <input
-                                        type="number"
-                                        step="0.01"
-                                        min="0"
-                                        placeholder="Bilinmiyorsa boş bırakın"
-                                        value={itemForm.amount}
-                                        onChange={e => setItemForm({ ...itemForm, amount: e.target.value })}
-                                        className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-indigo-500/20 text-sm font-bold"
-                                    />
-                                </div>
-                                <div>
-                                    <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Ödeme Günü</label>
-                                    <input
-                                        type="number"
-                                        min="1"
-                                        max="31"
-                                        value={itemForm.day}
-                                        onChange={e => setItemForm({ ...itemForm, day: e.target.value })}
-                                        className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-indigo-500/20 text-sm font-medium"
-                                    />
-                                </div>
-                            </div>
-                            <div className="flex gap-3 pt-2">
-                                <button type="button" onClick={resetItemForm} className="flex-1 py-2.5 rounded-xl font-bold text-slate-600 hover:bg-slate-50 dark:hover:bg-slate-800 transition-colors">
-                                    İptal
-                                </button>
-                                <button type="submit" className="flex-1 py-2.5 rounded-xl font-bold bg-slate-900 dark:bg-indigo-600 text-white hover:bg-slate-800 dark:hover:bg-indigo-700 transition-colors shadow-lg">
-                                    {editItem ? 'Güncelle' : 'Ekle'}
-                                </button>
-                            </div>
-                        </form>
-                    </div>
-                </div>
-            )}
-
-            {/* Payment Record Form Dialog */}
-            {showPaymentForm && (
-                <div className="fixed inset-0 z-50 flex items-center justify-center p-4 bg-black/40 backdrop-blur-sm animate-fade-in" onClick={() => setShowPaymentForm(null)}>
-                    <div className="bg-white dark:bg-slate-900 rounded-2xl p-6 max-w-md w-full shadow-2xl border border-slate-100 dark:border-slate-800 animate-scale-in" onClick={e => e.stopPropagation()}>
-                        <h3 className="text-lg font-bold text-slate-900 dark:text-white mb-1 flex items-center gap-2">
-                            <span className="material-icons-round text-emerald-600">payments</span>
-                            Ödeme Kaydı Ekle
-                        </h3>
-                        <p className="text-sm text-slate-500 mb-4">
-                            <span className="font-bold text-slate-700 dark:text-slate-300">{showPaymentForm.name}</span> için ödeme bilgisi girin.
-                        </p>
-                        <form onSubmit={handlePaymentSubmit} className="space-y-4">
-                            <div className="grid grid-cols-2 gap-4">
-                                <div>
-                                    <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Ödeme Tarihi</label>
-                                    <input
-                                        autoFocus
-                                        type="date"
-                                        value={paymentForm.payment_date}
-                                        onChange={e => setPaymentForm({ ...paymentForm, payment_date: e.target.value })}
-                                        className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-emerald-500/20 text-sm font-medium"
-                                        required
-                                    />
-                                </div>
-                                <div>
-                                    <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Tutar (TL)</label>
-                                    <input
-                                        type="number"
-                                        step="0.01"
-                                        min="0"
-                                        placeholder="0.00"
-                                        value={paymentForm.amount}
-                                        onChange={e => setPaymentForm({ ...paymentForm, amount: e.target.value })}
-                                        className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-emerald-500/20 text-sm font-bold"
-                                        required
-                                    />
-                                </div>
-                            </div>
-                            <div>
-                                <label className="block text-xs font-bold text-slate-500 uppercase mb-1">Not (Opsiyonel)</label>
-                                <input
-                                    type="text"
-                                    placeholder="Örn: Banka havalesi ile ödendi"
-                                    value={paymentForm.note}
-                                    onChange={e => setPaymentForm({ ...paymentForm, note: e.target.value })}
-                                    className="w-full px-4 py-2.5 rounded-xl bg-slate-50 dark:bg-slate-800 border border-slate-200 dark:border-slate-700 outline-none focus:ring-2 focus:ring-emerald-500/20 text-sm font-medium"
-                                    maxLength={280}
-                                />
-                            </div>
-                            <div className="flex gap-3 pt-2">
-                                <button type="button" onClick={() => setShowPaymentForm(null)} className="flex-1 py-2.5 rounded-xl font-bold text-slate-600 hover:bg-slate-50 dark:hover:bg-slate-800 transition-colors">
-                                    İptal
-                                </button>
-                                <button type="submit" className="flex-1 py-2.5 rounded-xl font-bold bg-emerald-600 text-white hover:bg-emerald-700 transition-colors shadow-lg shadow-emerald-200 dark:shadow-none flex items-center justify-center gap-2">
-                                    <span className="material-icons-round text-sm">check</span>
-                                    Ödemeyi Kaydet
-                                </button>
-                            </div>
-                        </form>
-                    </div>
-                </div>
-            )}
+            {/* Form Dialogs (own their form state so typing doesn't re-render the list) */}
+            <Suspense fallback={null}>
+                {showGroupForm && (
+                    <GroupFormDialog initial={editGroup} onSubmit={handleGroupSubmit} onClose={closeGroupForm} />
+                )}
+                {showItemForm && (
+                    <ItemFormDialog initialItem={editItem} onSubmit={handleItemSubmit} onClose={closeItemForm} />
+                )}
+                {showPaymentForm && (
+                    <PaymentFormDialog item={showPaymentForm} onSubmit={handlePaymentSubmit} onClose={closePaymentForm} />
+                )}
+            </Suspense>
 
             {/* Groups & Items */}
             {groups.length === 0 ? (
@@ -466,7 +776,7 @@ const Expenses = () => {
                     <h3 className="text-lg font-bold text-slate-900 dark:text-white mb-2">Henüz sabit gider grubu yok</h3>
                     <p className="text-sm text-slate-500 mb-6 max-w-sm">Kira, fatura ve abonelik gibi düzenli giderlerinizi gruplar halinde takip etmeye başlayın.</p>
                     <button
-                        onClick={() => { resetGroupForm(); setShowGroupForm(true); }}
+                        onClick={openNewGroup}
                         className="bg-indigo-600 hover:bg-indigo-700 text-white px-6 py-3 rounded-xl font-bold text-sm transition-all flex items-center gap-2 shadow-lg shadow-indigo-200 dark:shadow-none"
                     >
                         <span className="material-icons-round text-lg">add</span>
@@ -475,222 +785,21 @@ const Expenses = () => {
                 </div>
             ) : (
                 <div className="space-y-6">
-                    {groups.map(group => {
-                        const groupPaid = (group.items || []).filter(i => i.status === 'paid').length;
-                        const groupTotal = (group.items || []).length;
-                        const catIcon = CATEGORY_ICONS[group.category_type] || 'folder';
-
-                        return (
-                            <div key={group.id} className="bg-white dark:bg-slate-900 rounded-2xl border border-slate-200 dark:border-slate-800 shadow-sm overflow-hidden">
-                                {/* Group Header */}
-                                <div className="p-5 border-b border-slate-100 dark:border-slate-800 flex flex-col sm:flex-row justify-between items-start sm:items-center gap-3">
-                                    <div className="flex items-center gap-3 min-w-0">
-                                        <div className="w-10 h-10 rounded-xl bg-indigo-50 dark:bg-indigo-900/30 flex items-center justify-center flex-shrink-0">
-                                            <span className="material-icons-round text-indigo-600 dark:text-indigo-400">{catIcon}</span>
-                                        </div>
-                                        <div className="min-w-0">
-                                            <h3 className="font-bold text-slate-900 dark:text-white text-base truncate">{group.title}</h3>
-                                            <div className="flex items-center gap-2">
-                                                <span className="text-xs text-slate-400 font-medium">{group.category_type}</span>
-                                                <span className="text-xs text-slate-300 dark:text-slate-600">|</span>
-                                                <span className="text-xs text-slate-400">{groupPaid}/{groupTotal} ödendi</span>
-                                                {group.total_amount > 0 && (
-                                                    <>
-                                                        <span className="text-xs text-slate-300 dark:text-slate-600">|</span>
-                                                        <span className="text-xs font-bold text-slate-600 dark:text-slate-300">{fmtCurrency(group.total_amount)}</span>
-                                                    </>
-                                                )}
-                                            </div>
-                                        </div>
-                                    </div>
-                                    <div className="flex items-center gap-1 flex-shrink-0">
-                                        <button
-                                            onClick={() => { resetItemForm(); setShowItemForm(group.id); }}
-                                            className="p-2 rounded-lg text-slate-400 hover:text-indigo-600 hover:bg-indigo-50 dark:hover:bg-indigo-900/20 transition-all"
-                                            title="Kalem Ekle"
-                                        >
-                                            <span className="material-icons-round text-lg">add_circle_outline</span>
-                                        </button>
-                                        <button
-                                            onClick={() => openEditGroup(group)}
-                                            className="p-2 rounded-lg text-slate-400 hover:text-slate-700 hover:bg-slate-50 dark:hover:bg-slate-800 transition-all"
-                                            title="Düzenle"
-                                        >
-                                            <span className="material-icons-round text-lg">edit</span>
-                                        </button>
-                                        <button
-                                            onClick={() => setDeleteTarget({ type: 'group', id: group.id, label: group.title })}
-                                            className="p-2 rounded-lg text-slate-400 hover:text-red-600 hover:bg-red-50 dark:hover:bg-red-900/20 transition-all"
-                                            title="Sil"
-                                        >
-                                            <span className="material-icons-round text-lg">delete_outline</span>
-                                        </button>
-                                    </div>
-                                </div>
-
-                                {/* Items */}
-                                {(!group.items || group.items.length === 0) ? (
-                                    <div className="p-8 text-center text-slate-400">
-                                        <span className="material-icons-round text-3xl opacity-20 mb-2 block">inbox</span>
-                                        <p className="text-sm">Bu grupta henüz kalem yok.</p>
-                                        <button
-                                            onClick={() => { resetItemForm(); setShowItemForm(group.id); }}
-                                            className="mt-3 text-indigo-600 hover:text-indigo-700 text-sm font-bold inline-flex items-center gap-1"
-                                        >
-                                            <span className="material-icons-round text-sm">add</span>
-                                            Kalem Ekle
-                                        </button>
-                                    </div>
-                                ) : (
-                                    <div className="divide-y divide-slate-50 dark:divide-slate-800">
-                                        {group.items.map(item => {
-                                            const sb = STATUS_BADGE[item.status] || STATUS_BADGE.pending;
-                                            return (
-                                                <div key={item.id} className="p-4 hover:bg-slate-50/50 dark:hover:bg-slate-800/30 transition-colors group/item">
-                                                    <div className="flex items-center gap-4">
-                                                        {/* Payment Toggle */}
-                                                        <button
-                                                            onClick={() => handlePaymentToggle(item)}
-                                                            className={`w-8 h-8 rounded-full flex items-center justify-center flex-shrink-0 transition-all ${item.status === 'paid'
-                                                                ? 'bg-emerald-100 dark:bg-emerald-900/40 text-emerald-600 dark:text-emerald-400'
-                                                                : 'bg-slate-100 dark:bg-slate-800 text-slate-300 dark:text-slate-600 hover:bg-emerald-50 hover:text-emerald-500'
-                                                                }`}
-                                                            title={item.status === 'paid' ? 'Bekliyora çevir' : 'Ödendi olarak işaretle'}
-                                                        >
-                                                            <span className="material-icons-round text-lg">
-                                                                {item.status === 'paid' ? 'check' : 'radio_button_unchecked'}
-                                                            </span>
-                                                        </button>
-
-                                                        {/* Info */}
-                                                        <div className="flex-1 min-w-0">
-                                                            <div className="flex items-center gap-2 flex-wrap">
-                                                                <p className={`font-bold text-sm ${item.status === 'paid' ? 'text-slate-400 line-through' : 'text-slate-900 dark:text-white'}`}>
-                                                                    {item.name}
-                                                                </p>
-                                                                <span className={`text-[10px] font-bold px-2 py-0.5 rounded-full ${sb.color}`}>
-                                                                    {sb.label}
-                                                                </span>
-                                                            </div>
-                                                            <p className="text-xs text-slate-400 mt-0.5">
-                                                                Her ayın {item.day}. günü
-                                                                {item.month_payment?.payment_date && ` — Son ödeme: ${new Date(item.month_payment.payment_date).toLocaleDateString('tr-TR')}`}
-                                                            </p>
-                                                        </div>
-
-                                                        {/* Amount */}
-                                                        <p className={`font-bold text-sm flex-shrink-0 ${item.status === 'paid' ? 'text-emerald-600' : 'text-slate-900 dark:text-white'}`}>
-                                                            {fmtCurrency(item.amount)}
-                                                        </p>
-
-                                                        {/* Actions */}
-                                                        <div className="flex items-center gap-0.5 opacity-0 group-hover/item:opacity-100 transition-opacity flex-shrink-0">
-                                                            <button
-                                                                onClick={() => openPaymentForm(item)}
-                                                                className="p-1.5 rounded-lg text-slate-400 hover:text-emerald-600 hover:bg-emerald-50 dark:hover:bg-emerald-900/20 transition-all"
-                                                                title="Ödeme Kaydı Ekle"
-                                                            >
-                                                                <span className="material-icons-round text-base">add_card</span>
-                                                            </button>
-                                                            <button
-                                                                onClick={() => openEditItem(item, group.id)}
-                                                                className="p-1.5 rounded-lg text-slate-400 hover:text-slate-700 hover:bg-slate-100 dark:hover:bg-slate-800 transition-all"
-                                                                title="Düzenle"
-                                                            >
-                                                                <span className="material-icons-round text-base">edit</span>
-                                                            </button>
-                                                            <button
-                                                                onClick={() => setDeleteTarget({ type: 'item', id: item.id, label: item.name })}
-                                                                className="p-1.5 rounded-lg text-slate-400 hover:text-red-600 hover:bg-red-50 dark:hover:bg-red-900/20 transition-all"
-                                                                title="Sil"
-                                                            >
-                                                                <span className="material-icons-round text-base">delete_outline</span>
-                                                            </button>
-                                                        </div>
-                                                    </div>
-
-                                                    {/* Payment History */}
-                                                    {item.history && item.history.length > 0 && (
-                                                        <div className="ml-12 mt-2">
-                                                            <button
-                                                                onClick={() => toggleHistory(item.id)}
-                                                                className="flex items-center gap-1.5 text-xs text-slate-400 hover:text-indigo-600 transition-colors mb-1.5"
-                                                            >
-                                                                <span className="material-icons-round text-sm" style={{ transition: 'transform 0.2s', transform: expandedHistory[item.id] ? 'rotate(90deg)' : 'rotate(0deg)' }}>chevron_right</span>
-                                                                <span className="font-bold">Ödeme Geçmişi ({item.history.length})</span>
-                                                            </button>
-
-                                                            {/* Collapsed: mini badge view */}
-                                                            {!expandedHistory[item.id] && (
-                                                                <div className="flex items-center gap-1 flex-wrap">
-                                                                    {item.history.slice(0, 6).map((h, idx) => (
-                                                                        <span
-                                                                            key={idx}
-                                                                            className={`text-[9px] font-medium px-1.5 py-0.5 rounded ${h.status === 'paid'
-                                                                                ? 'bg-emerald-50 text-emerald-600 dark:bg-emerald-900/20 dark:text-emerald-400'
-                                                                                : 'bg-slate-100 text-slate-400 dark:bg-slate-800 dark:text-slate-500'
-                                                                                }`}
-                                                                            title={`${new Date(h.date).toLocaleDateString('tr-TR')} — ${fmtCurrency(h.amount)}${h.note ? ' — ' + h.note : ''}`}
-                                                                        >
-                                                                            {new Date(h.date).toLocaleDateString('tr-TR', { month: 'short', year: '2-digit' })}
-                                                                        </span>
-                                                                    ))}
-                                                                    {item.history.length > 6 && (
-                                                                        <span className="text-[9px] text-slate-400 font-medium">+{item.history.length - 6}</span>
-                                                                    )}
-                                                                </div>
-                                                            )}
-
-                                                            {/* Expanded: full timeline */}
-                                                            {expandedHistory[item.id] && (
-                                                                <div className="relative pl-4 border-l-2 border-slate-100 dark:border-slate-800 space-y-2 mt-1">
-                                                                    {item.history.map((h, idx) => (
-                                                                        <div key={idx} className="relative">
-                                                                            <div className={`absolute -left-[21px] top-1 w-3 h-3 rounded-full border-2 border-white dark:border-slate-900 ${h.status === 'paid' ? 'bg-emerald-500' : 'bg-slate-300 dark:bg-slate-600'}`}></div>
-                                                                            <div className="flex items-center gap-2 flex-wrap">
-                                                                                <span className="text-xs font-bold text-slate-700 dark:text-slate-300">
-                                                                                    {new Date(h.date).toLocaleDateString('tr-TR', { day: 'numeric', month: 'long', year: 'numeric' })}
-                                                                                </span>
-                                                                                <span className={`text-xs font-bold ${h.status === 'paid' ? 'text-emerald-600' : 'text-amber-500'}`}>
-                                                                                    {fmtCurrency(h.amount)}
-                                                                                </span>
-                                                                                <span className={`text-[9px] font-bold px-1.5 py-0.5 rounded-full ${h.status === 'paid'
-                                                                                    ? 'bg-emerald-50 text-emerald-600 dark:bg-emerald-900/20 dark:text-emerald-400'
-                                                                                    : 'bg-amber-50 text-amber-600 dark:bg-amber-900/20 dark:text-amber-400'
-                                                                                    }`}>
-                                                                                    {h.status === 'paid' ? 'Ödendi' : 'Bekliyor'}
-                                                                                </span>
-                                                                            </div>
-                                                                            {h.note && (
-                                                                                <p className="text-[10px] text-slate-400 mt-0.5 italic">💬 {h.note}</p>
-                                                                            )}
-                                                                        </div>
-                                                                    ))}
-                                                                </div>
-                                                            )}
-                                                        </div>
-                                                    )}
-
-                                                    {/* No history yet - subtle link */}
-                                                    {(!item.history || item.history.length === 0) && (
-                                                        <div className="ml-12 mt-1">
-                                                            <button
-                                                                onClick={() => openPaymentForm(item)}
-                                                                className="text-[10px] text-slate-300 hover:text-emerald-500 transition-colors flex items-center gap-1"
-                                                            >
-                                                                <span className="material-icons-round text-xs">add_circle_outline</span>
-                                                                İlk ödeme kaydını ekle
-                                                            </button>
-                                                        </div>
-                                                    )}
-                                                </div>
-                                            );
-                                        })}
-                                    </div>
-                                )}
-                            </div>
-                        );
-                    })}
+                    {groups.map(group => (
+                        <GroupCard
+                            key={group.id}
+                            group={group}
+                            expandedHistory={expandedHistory}
+                            onAddItem={openAddItem}
+                            onEditGroup={openEditGroup}
+                            onDeleteGroup={confirmDeleteGroup}
+                            onToggleItem={handlePaymentToggle}
+                            onEditItem={openEditItem}
+                            onDeleteItem={confirmDeleteItem}
+                            onAddPayment={openPaymentForm}
+                            onToggleHistory={toggleHistory}
+                        />
+                    ))}
                 </div>
             )}
         </DashboardLayout>
@@ -67,6 +67,8 @@ const fetchWithAuth = async (endpoint, options = {}) => {
                 throw new Error('Session expired');
             }
         } catch (e) {
+            // Çağıran isteği iptal ettiyse (ör. hızlı ay geçişi) oturum kapatılmaz
+            if (e.name === 'AbortError') throw e;
             localStorage.clear();
             window.location.href = '/login';
             throw e;
@@ -191,9 +193,9 @@ export const api = {
     addSubscription: (data) => fetchWithAuth('/subscriptions', { method: 'POST', body: JSON.stringify(data) }),
     deleteSubscription: (id) => fetchWithAuth(`/subscriptions/${id}`, { method: 'DELETE' }),
 
-    getFixedExpenses: (month) => {
+    getFixedExpenses: (month, { signal } = {}) => {
         const query = month ? `?month=${month}` : '';
-        return fetchWithAuth(`/fixed-expenses${query}`);
+        return fetchWithAuth(`/fixed-expenses${query}`, { signal });
     },
     createFixedExpenseGroup: (data) => fetchWithAuth('/fixed-expenses/groups', {
         method: 'POST',
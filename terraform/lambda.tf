@@ -62,7 +62,8 @@ resource "aws_iam_role_policy" "lambda_ai_services_policy" {
       },
       {
         Action = [
-          "ssm:GetParameter"
+          "ssm:GetParameter",
+          "ssm:GetParameters"
         ]
         Effect   = "Allow"
         Resource = [